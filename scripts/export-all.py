@@ -7,6 +7,9 @@ Usage:
 .. code-block:: shell
 
     ./scripts/run_script.py scripts/export-all.py
+
+The number of shards exported in parallel is read from ``EXPORTER_SHARDS``
+(e.g. set ``INVENIO_EXPORTER_SHARDS=8`` in the job environment).
 """
 
 from invenio_app.factory import create_api
@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Keyword matcher tests."""
+
+from zenodo_rdm.curation.matcher import KeywordHit, KeywordMatcher
+
+
+def test_keyword_matcher_ignores_case():
+    """Keywords are matched regardless of their case."""
+    matcher = KeywordMatcher(["Horizon Europe"])
+    assert matcher.count("funded by horizon europe") == 1
+
+
+def test_keyword_matcher_prefers_longest_keyword():
+    """A keyword that contains another one is matched as a whole."""
+    matcher = KeywordMatcher(["horizon", "horizon 2020"])
+    assert matcher.find("the horizon 2020 programme") == [KeywordHit("horizon 2020", 4)]
+
+
+def test_keyword_matcher_counts_distinct_keywords():
+    """Repeated keywords are counted once."""
+    matcher = KeywordMatcher(["erc", "marie curie"])
+    assert matcher.count("erc grant, erc project, marie curie fellow") == 2
+    assert matcher.count("no funding") == 0
+
+
+def test_keyword_matcher_without_keywords():
+    """A matcher without keywords finds nothing."""
+    matcher = KeywordMatcher([])
+    assert matcher.find("horizon 2020") == []
+    assert matcher.count("horizon 2020") == 0
+
+
+def test_keyword_matcher_finds_positions():
+    """Hits are returned with their position, and never overlap."""
+    matcher = KeywordMatcher(["horizon 2020", "2020 grant", "erc"])
+    assert matcher.find("erc and horizon 2020 grant") == [
+        KeywordHit("erc", 0),
+        KeywordHit("horizon 2020", 8),
+    ]
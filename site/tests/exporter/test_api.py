@@ -10,6 +10,7 @@ from uuid import uuid4
 
 from invenio_files_rest.models import Bucket, ObjectVersion
 
+from zenodo_rdm.exporter.manifest import load_manifest
 from zenodo_rdm.exporter.tasks import export_records
 
 
@@ -37,7 +38,10 @@ def test_export_records_from_search_to_storage(
     assert bucket.max_file_size is None
     versions = ObjectVersion.get_by_bucket(bucket).all()
     assert {version.key for version in versions} == {
+        "manifest.json",
         "records-deleted.csv.gz",
+        "records-json.index.blocks.csv.gz",
+        "records-json.index.csv.gz",
         "records-json.tar.gz",
     }
 
@@ -71,3 +75,139 @@ def test_export_records_from_search_to_storage(
         ]
 
     assert list(tmp_path.iterdir()) == []
+
+
+def test_export_delta_records(
+    running_app,
+    publish_record,
+    minimal_record,
+    set_app_config_fn_scoped,
+    tmp_path,
+):
+    """Publish delta archives on top of a full export."""
+    bucket_id = uuid4()
+    set_app_config_fn_scoped(
+        {
+            "EXPORTER_BUCKET_UUID": bucket_id,
+            "EXPORTER_STAGING_PATH": str(tmp_path),
+        }
+    )
+    publish_record(dict(minimal_record, files={"enabled": False}))
+
+    # Without a snapshot, a delta export falls back to a full one
+    export_records(("json",), None, delta=True)
+    bucket = Bucket.get(bucket_id)
+    manifest = load_manifest(bucket, "")
+    assert manifest["archives"]["json"]["deltas"] == []
+
+    record = publish_record(dict(minimal_record, files={"enabled": False}))
+    export_records(("json",), None, delta=True)
+
+    manifest = load_manifest(bucket, "")
+    snapshot = manifest["archives"]["json"]["snapshot"]
+    (delta,) = manifest["archives"]["json"]["deltas"]
+    assert delta["since"] < snapshot["until"]
+    (file,) = delta["files"]
+    assert file["key"].startswith("records-json-delta-")
+
+    version = ObjectVersion.get(bucket, file["key"])
+    assert version.get_tags()["until"] == delta["until"]
+    with (
+        version.file.storage().open() as stream,
+        tarfile.open(fileobj=stream, mode="r:gz") as archive,
+    ):
+        names = [member.name for member in archive.getmembers()]
+    assert f"{record.id}.json" in names
+
+
+def test_export_records_streaming(
+    running_app,
+    publish_record,
+    minimal_record,
+    set_app_config_fn_scoped,
+    tmp_path,
+):
+    """Stream export archives into storage without staging them."""
+    bucket_id = uuid4()
+    set_app_config_fn_scoped(
+        {
+            "EXPORTER_BUCKET_UUID": bucket_id,
+            "EXPORTER_STAGING_PATH": str(tmp_path),
+            "EXPORTER_STREAMING": True,
+        }
+    )
+    record = publish_record(dict(minimal_record, files={"enabled": False}))
+
+    export_records(("json",), None)
+
+    bucket = Bucket.get(bucket_id)
+    records = ObjectVersion.get(bucket, "records-json.tar.gz")
+    assert records.file.readable
+    assert records.file.checksum
+    with (
+        records.file.storage().open() as stream,
+        tarfile.open(fileobj=stream, mode="r:gz") as archive,
+    ):
+        assert [member.name for member in archive.getmembers()] == [f"{record.id}.json"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_read_single_record_from_export(
+    running_app,
+    client,
+    publish_record,
+    minimal_record,
+    set_app_config_fn_scoped,
+    tmp_path,
+):
+    """Serve one record of an export archive, using its index sidecar."""
+    set_app_config_fn_scoped(
+        {
+            "EXPORTER_BUCKET_UUID": uuid4(),
+            "EXPORTER_STAGING_PATH": str(tmp_path),
+        }
+    )
+    record = publish_record(dict(minimal_record, files={"enabled": False}))
+
+    export_records(("json",), None)
+
+    response = client.get(f"/exporter/records-json.tar.gz/records/{record.id}")
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.json["id"] == record.id
+
+    response = client.get("/exporter/records-json.tar.gz/records/unknown")
+    assert response.status_code == 404
+
+
+def test_export_records_point_in_time(
+    running_app,
+    publish_record,
+    minimal_record,
+    set_app_config_fn_scoped,
+    tmp_path,
+):
+    """Read the exported records through pages of a point in time."""
+    bucket_id = uuid4()
+    set_app_config_fn_scoped(
+        {
+            "EXPORTER_BUCKET_UUID": bucket_id,
+            "EXPORTER_STAGING_PATH": str(tmp_path),
+            "EXPORTER_READER": "point_in_time",
+            "EXPORTER_READER_PAGE_SIZE": 1,
+        }
+    )
+    records = [
+        publish_record(dict(minimal_record, files={"enabled": False})) for _ in range(3)
+    ]
+
+    export_records(("json",), None)
+
+    bucket = Bucket.get(bucket_id)
+    version = ObjectVersion.get(bucket, "records-json.tar.gz")
+    with (
+        version.file.storage().open() as stream,
+        tarfile.open(fileobj=stream, mode="r:gz") as archive,
+    ):
+        names = {member.name for member in archive.getmembers()}
+    assert names == {f"{record.id}.json" for record in records}
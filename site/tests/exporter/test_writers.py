@@ -7,7 +7,18 @@ import gzip
 import json
 import tarfile
 
-from zenodo_rdm.exporter.writers import write_archives
+import pyarrow.parquet as pq
+import pytest
+
+from zenodo_rdm.exporter import datacite, parquet
+from zenodo_rdm.exporter.blocks import (
+    find_entry,
+    load_directory,
+    load_index,
+    read_record,
+)
+from zenodo_rdm.exporter.datacite import MemoizedDataCite45Schema
+from zenodo_rdm.exporter.writers import merge_archives, write_archives
 
 
 def _tar_members(path):
@@ -36,13 +47,15 @@ def test_write_export_files(app, tmp_path):
 
     assert [path.name for path in paths] == [
         "records-json.tar.gz",
+        "records-json.index.csv.gz",
+        "records-json.index.blocks.csv.gz",
         "records-deleted.csv.gz",
     ]
     members = _tar_members(paths[0])
     assert json.loads(members["active.json"]) == records[0]
     assert "deleted.json" not in members
 
-    with gzip.open(paths[1], mode="rt") as stream:
+    with gzip.open(paths[3], mode="rt") as stream:
         rows = list(csv.reader(stream))
     assert rows[1][0:2] == ["deleted", "10.5281/zenodo.1"]
 
@@ -67,3 +80,192 @@ def test_write_consumes_records_once_for_all_outputs(app, tmp_path):
     assert iterations == ["started"]
     assert _tar_members(paths[0]) == {}
     assert _tar_members(paths[1]) == {}
+    with paths[2].open("rb") as stream:
+        assert load_index(stream) == {}
+
+
+def test_merge_shard_fragments(app, tmp_path):
+    """Fragments are merged into complete or multi-part archives."""
+    deleted = {
+        "id": "deleted",
+        "deletion_status": {"is_deleted": True},
+        "pids": {"doi": {"identifier": "10.5281/zenodo.1"}},
+        "parent": {},
+        "tombstone": {"removal_reason": {"id": "spam"}},
+    }
+    shards = [
+        [{"id": "first", "metadata": {"title": "First"}}],
+        [{"id": "second", "metadata": {"title": "Second"}}, deleted],
+    ]
+
+    with app.app_context():
+        fragments = []
+        for index, records in enumerate(shards):
+            shard_path = tmp_path / f"shard-{index}"
+            shard_path.mkdir()
+            fragments.append(
+                write_archives(shard_path, ("json",), records, complete=False)
+            )
+        paths = merge_archives(tmp_path, ("json",), fragments)
+        parts = merge_archives(tmp_path, ("json",), fragments, multipart=True)
+
+    assert [path.name for path in paths] == [
+        "records-json.tar.gz",
+        "records-json.index.csv.gz",
+        "records-json.index.blocks.csv.gz",
+        "records-deleted.csv.gz",
+    ]
+    assert set(_tar_members(paths[0])) == {"first.json", "second.json"}
+    with paths[1].open("rb") as stream:
+        index = load_index(stream)
+    with paths[0].open("rb") as stream:
+        for record in shards[0] + shards[1][:1]:
+            content = read_record(stream, index[record["id"]])
+            assert json.loads(content) == record
+    with gzip.open(paths[3], mode="rt") as stream:
+        rows = list(csv.reader(stream))
+    assert rows[0][0] == "record_id"
+    assert [row[0] for row in rows[1:]] == ["deleted"]
+
+    assert [path.name for path in parts] == [
+        "records-json.part-0001.tar.gz",
+        "records-json.part-0002.tar.gz",
+        "records-json.part-0001.index.csv.gz",
+        "records-json.part-0002.index.csv.gz",
+        "records-json.part-0001.index.blocks.csv.gz",
+        "records-json.part-0002.index.blocks.csv.gz",
+        "records-deleted.csv.gz",
+    ]
+    assert set(_tar_members(parts[0])) == {"first.json"}
+    assert set(_tar_members(parts[1])) == {"second.json"}
+
+
+def test_datacite_schema_memoizes_vocabulary_lookups(app, monkeypatch):
+    """Vocabulary lookups are made once per schema."""
+    lookups = []
+
+    def get_vocabulary_props(vocabulary, fields, id_):
+        lookups.append((vocabulary, fields, id_))
+        return {"datacite_general": "Image", "datacite": "Editor"}
+
+    monkeypatch.setattr(datacite, "get_vocabulary_props", get_vocabulary_props)
+    record = {
+        "metadata": {
+            "resource_type": {"id": "image"},
+            "contributors": [
+                {
+                    "person_or_org": {"name": "Doe, John", "type": "personal"},
+                    "role": {"id": "editor"},
+                }
+            ],
+        }
+    }
+    with app.app_context():
+        schema = MemoizedDataCite45Schema()
+        for _ in range(3):
+            resource_type = schema.get_type(record)
+            assert resource_type["resourceTypeGeneral"] == "Image"
+            contributors = schema.get_contributors(record)
+            assert contributors[0]["contributorType"] == "Editor"
+        assert len(lookups) == 2
+
+        # Each lookup returns its own copy of the props
+        props = schema.vocabulary_props.get(
+            "resourcetypes", ["props.datacite_general", "props.datacite_type"], "image"
+        )
+        props["datacite_general"] = "Other"
+        assert schema.get_type(record)["resourceTypeGeneral"] == "Image"
+
+        # Other schemas, e.g. of other serializers, have their own memo
+        assert len(lookups) == 2
+        MemoizedDataCite45Schema().get_type(record)
+        assert len(lookups) == 3
+
+
+def test_read_single_records_from_blocks(app, tmp_path, set_app_config_fn_scoped):
+    """Records are read from the block they are in, using the index."""
+    set_app_config_fn_scoped({"EXPORTER_BLOCK_SIZE": 1024})
+    records = [
+        {"id": str(index), "metadata": {"title": "x" * 300}} for index in range(20)
+    ]
+
+    with app.app_context():
+        archive, index_path, directory_path, _ = write_archives(
+            tmp_path, ("json",), records
+        )
+
+    assert len(_tar_members(archive)) == len(records)
+    with index_path.open("rb") as stream:
+        index = load_index(stream)
+    assert len({entry.block_offset for entry in index.values()}) > 1
+    with archive.open("rb") as stream:
+        for record in reversed(records):
+            assert json.loads(read_record(stream, index[record["id"]])) == record
+
+
+def test_find_index_entries_by_block(app, tmp_path, monkeypatch):
+    """Index entries are found by reading one block of the sorted index."""
+    monkeypatch.setattr("zenodo_rdm.exporter.blocks.INDEX_BLOCK_ROWS", 3)
+    records = [{"id": str(index), "metadata": {}} for index in (5, 3, 9, 1, 7, 2, 8)]
+
+    with app.app_context():
+        _, index_path, directory_path, _ = write_archives(tmp_path, ("json",), records)
+
+    with directory_path.open("rb") as stream:
+        directory = load_directory(stream)
+    record_ids, blocks = directory
+    assert record_ids == ["1", "5", "9"]
+    with index_path.open("rb") as stream:
+        index = load_index(stream)
+        # Rows are sorted by record ID
+        assert list(index) == sorted(record["id"] for record in records)
+        for record_id, entry in index.items():
+            assert find_entry(stream, directory, record_id) == entry
+        assert find_entry(stream, directory, "0") is None
+        assert find_entry(stream, directory, "4") is None
+
+
+def test_write_parquet_table(app, tmp_path):
+    """Records are flattened into typed columns of a Parquet table."""
+    records = [
+        {
+            "id": "active",
+            "pids": {"doi": {"identifier": "10.5281/zenodo.2"}},
+            "parent": {"id": "parent", "communities": {"ids": ["community"]}},
+            "created": "2024-01-01T12:00:00+00:00",
+            "metadata": {
+                "title": "Test",
+                "resource_type": {"id": "image-photo"},
+                "creators": [{"person_or_org": {"name": "Doe, John"}}],
+                "funding": [{"funder": {"id": "00k4n6c32"}, "award": {"number": "1"}}],
+            },
+            "files": {"count": 2, "total_bytes": 1024},
+            "access": {"record": "public", "files": "public"},
+        },
+    ]
+
+    with app.app_context():
+        paths = write_archives(tmp_path, ("parquet",), records)
+
+    assert [path.name for path in paths] == [
+        "records-parquet.parquet",
+        "records-deleted.csv.gz",
+    ]
+    (row,) = pq.read_table(paths[0]).to_pylist()
+    assert row["doi"] == "10.5281/zenodo.2"
+    assert row["resource_type"] == "image-photo"
+    assert row["created"].year == 2024
+    assert row["creators"] == ["Doe, John"]
+    assert row["funders"] == ["00k4n6c32"]
+    assert row["awards"] == ["1"]
+    assert row["communities"] == ["community"]
+    assert (row["file_count"], row["file_size"]) == (2, 1024)
+
+
+def test_write_parquet_table_without_pyarrow(app, tmp_path, monkeypatch):
+    """Writing the parquet format fails clearly when pyarrow is missing."""
+    monkeypatch.setattr(parquet, "pa", None)
+
+    with app.app_context():
+        with pytest.raises(parquet.PyArrowMissingError):
+            write_archives(tmp_path, ("parquet",), [])
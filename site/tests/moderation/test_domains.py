@@ -4,6 +4,11 @@
 
 import pytest
 
+from zenodo_rdm.moderation.domains import (
+    DomainTrie,
+    bump_domains_version,
+    get_domain_trie,
+)
 from zenodo_rdm.moderation.models import LinkDomain, LinkDomainStatus
 
 
@@ -39,3 +44,47 @@ def test_lookup_domain(domains, domain, expected_status):
         assert LinkDomain.lookup_domain(domain) is None
     else:
         assert LinkDomain.lookup_domain(domain).status == expected_status
+
+    # The in-memory trie matches the same domains as the database lookup
+    match = DomainTrie.load().lookup_url(domain)
+    assert (match.status if match else None) == expected_status
+
+
+def test_domain_trie_reload(domains, db):
+    """Test that the domain trie is rebuilt when the domains are modified."""
+    trie = get_domain_trie()
+    assert get_domain_trie() is trie
+    assert trie.lookup_url("https://example.com") is None
+
+    LinkDomain.create("example.com", LinkDomainStatus.BANNED)
+    db.session.commit()
+    bump_domains_version()
+
+    trie = get_domain_trie()
+    assert trie.lookup_url("https://example.com").status == LinkDomainStatus.BANNED
+
+
+def test_bulk_upsert_domains(domains, db):
+    """Test creating and updating domains in bulk."""
+    LinkDomain.bulk_upsert(
+        [
+            {
+                "domain": "blog.io",
+                "status": LinkDomainStatus.BANNED,
+                "score": 20,
+                "reason": None,
+            },
+            {
+                "domain": "example.com",
+                "status": LinkDomainStatus.SAFE,
+                "score": None,
+                "reason": "Example",
+            },
+        ]
+    )
+    db.session.commit()
+
+    blog = LinkDomain.lookup_domain("https://blog.io/article")
+    assert (blog.status, blog.score) == (LinkDomainStatus.BANNED, 20)
+    example = LinkDomain.lookup_domain("https://example.com")
+    assert (example.status, example.reason) == (LinkDomainStatus.SAFE, "Example")
@@ -0,0 +1,42 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Moderation features tests."""
+
+from zenodo_rdm.moderation.features import ModerationFeatures
+
+
+def test_extract_features():
+    """Test extracting the moderation features of metadata."""
+    metadata = {
+        "title": "Cheap tickets 😀😀 at https://spam.cam/offer",
+        "description": (
+            '<h1>Offer</h1><a href="https://spam.cam/a">a</a> https://www.blog.io/post'
+        ),
+        "creators": [{"person_or_org": {"name": "Doe, John"}}],
+        "related_identifiers": [{"identifier": "https://physics.edu.ch/paper"}],
+    }
+
+    features = ModerationFeatures(metadata)
+
+    assert features.links == [
+        "https://spam.cam/offer",
+        "https://spam.cam/a",
+        "https://www.blog.io/post",
+        "https://physics.edu.ch/paper",
+    ]
+    assert features.description_links == [
+        "https://spam.cam/a",
+        "https://www.blog.io/post",
+    ]
+    assert features.domains == [".cam.spam", ".cam.spam", ".io.blog", ".ch.edu.physics"]
+    assert features.emoji_count == 1
+    assert features.header_tag_count == 1
+    assert features.text_length == sum(
+        len(text)
+        for text in (
+            metadata["title"],
+            metadata["description"],
+            "Doe, John",
+            "https://physics.edu.ch/paper",
+        )
+    )
@@ -4,6 +4,7 @@
 
 from invenio_db import db
 
+from zenodo_rdm.cli import sync_queries
 from zenodo_rdm.moderation.models import ModerationQuery
 
 
@@ -30,8 +31,41 @@ def test_moderation_query_creation(app):
                 query.notes == notes,
                 query.score == score,
                 query.active == active,
+                query.record_cls == "records",
             ]
         )
 
 
 # TODO: Add test for matching query
+
+
+def test_moderation_query_bulk_creation(app):
+    """Test to create ModerationQuery rows in bulk."""
+    with app.app_context():
+        entries = [
+            {"query_string": f"metadata.title:Bulk{i}", "notes": None, "score": i}
+            for i in range(3)
+        ]
+        query_ids = ModerationQuery.bulk_create(
+            [
+                {**entry, "active": True, "record_cls": "communities"}
+                for entry in entries
+            ]
+        )
+        db.session.commit()
+
+        assert len(query_ids) == 3
+        queries = ModerationQuery.query.filter(ModerationQuery.id.in_(query_ids))
+        assert sorted(query.score for query in queries) == [0, 1, 2]
+        assert {query.record_cls for query in queries} == {"communities"}
+
+
+def test_sync_queries_without_record_class(app, cli_runner):
+    """Test that queries without a record class are not synced to any index."""
+    with app.app_context():
+        ModerationQuery.create("metadata.title:Unknown", record_cls=None)
+        db.session.commit()
+
+        result = cli_runner(sync_queries, "--record-cls", "communities")
+        assert result.exit_code != 0
+        assert "1 moderation queries have no record class" in result.output
@@ -0,0 +1,36 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Funding relevance result cache tests."""
+
+from datetime import timedelta
+
+from invenio_db import db
+
+from zenodo_rdm.orcha.cache import get_result_key
+from zenodo_rdm.orcha.models import FundingRelevanceResult
+
+
+def test_funding_relevance_result_cache(app):
+    """Test storing and reusing funding relevance workflow results."""
+    with app.app_context():
+        metadata = {"title": "Test", "description": "A test record"}
+        key = get_result_key(metadata, "An EU grant", "rule")
+        assert key != get_result_key(metadata, "An EU grant", "another rule")
+        assert key != get_result_key(metadata, "Another EU grant", "rule")
+
+        max_age = timedelta(days=1)
+        assert FundingRelevanceResult.get(*key, max_age) is None
+
+        FundingRelevanceResult.set(*key, {"match": False, "message": "No"})
+        FundingRelevanceResult.set(*key, {"match": True, "message": "Yes"})
+        db.session.commit()
+        assert FundingRelevanceResult.get(*key, max_age) == {
+            "match": True,
+            "message": "Yes",
+        }
+
+        # Expired results are not reused
+        assert FundingRelevanceResult.get(*key, timedelta(0)) is None
+        assert FundingRelevanceResult.delete_expired(timedelta(0)) == 1
+        db.session.commit()
+        assert FundingRelevanceResult.get(*key, max_age) is None
@@ -0,0 +1,19 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Create ZenodoRDM branch."""
+
+# revision identifiers, used by Alembic.
+revision = "1792213189"
+down_revision = None
+branch_labels = ("zenodo_rdm",)
+depends_on = "dbdbc1b19cf2"
+
+
+def upgrade():
+    """Upgrade database."""
+    pass
+
+
+def downgrade():
+    """Downgrade database."""
+    pass
@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Add the record class of moderation queries."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1792213190"
+down_revision = "1792213189"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    # Existing queries are left without a record class, since the percolator
+    # index they were added to is not known.
+    op.add_column(
+        "moderation_queries",
+        sa.Column("record_cls", sa.String(length=32), nullable=True),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_column("moderation_queries", "record_cls")
@@ -0,0 +1,28 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Add an index to find user moderation requests."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1792213191"
+down_revision = "1792213190"
+branch_labels = ()
+# Create the requests tables first
+depends_on = "a14fa442680f"
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_index(
+        "ix_request_metadata_type_topic_user",
+        "request_metadata",
+        [sa.text("(json ->> 'type')"), sa.text("(json #>> '{topic,user}')")],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index("ix_request_metadata_type_topic_user", table_name="request_metadata")
@@ -8,6 +8,7 @@
 import hashlib
 import json
 
+from flask import current_app
 from invenio_access.permissions import system_identity
 from invenio_checks.base import Check, CheckResult
 from invenio_checks.models import CheckConfig
@@ -18,7 +19,12 @@ from invenio_records_resources.proxies import current_service_registry
 from invenio_requests.proxies import current_requests_service
 from invenio_search.api import dsl
 
-from zenodo_rdm.orcha.utils import run_funding_relevance_workflow
+from zenodo_rdm.orcha.cache import get_result
+from zenodo_rdm.orcha.utils import (
+    get_funding_relevance_key,
+    run_funding_relevance_workflow,
+    trigger_funding_relevance_workflow,
+)
 
 
 class FundingCheck(Check):
@@ -106,8 +112,8 @@ class FundingCheck(Check):
         description, as well as the award description) has changed since the last check
         run. Otherwise, return False as the last run can be reused.
 
-        A pending or running run keeps the last completed hash, so an unrelated edit
-        waits for it instead of starting a second run.
+        A run waiting for its workflow already stores the hash of the new inputs, so an
+        unrelated edit waits for it instead of starting a second run.
         """
         community = current_communities.service.record_cls.get_record(config.community_id)
         awards = self._get_awards_description(record, community)
@@ -121,22 +127,8 @@ class FundingCheck(Check):
         input_hash = self._get_input_hash(check_metadata, awards)
         return previous_run.state.get("input_hash") != input_hash
 
-    def run(self, record, config: CheckConfig, **kwargs):
-        """Run the funding relevance check on a record with the given configuration."""
-        def get_updated_result(check_result, message, success):
-            check_result.success = success
-            check_result.description = message
-            if not success:
-                check_result.errors.append(
-                    {
-                        "field": "metadata.funding",
-                        "messages": [message],
-                        "description": description,
-                        "severity": config.severity.error_value,
-                    }
-                )
-            return check_result
-
+    def _get_result(self, config, message=None, success=True):
+        """Return the check result of a run, with an error unless successful."""
         params = config.params
         description = params.get(
             "funding_description",
@@ -148,15 +140,60 @@ class FundingCheck(Check):
             # NOTE: We default to the default description for now, while the check is running/pending
             description=description,
         )
+        if message is None:
+            return check_result
+
+        check_result.success = success
+        check_result.description = message
+        if not success:
+            check_result.errors.append(
+                {
+                    "field": "metadata.funding",
+                    "messages": [message],
+                    "description": description,
+                    "severity": config.severity.error_value,
+                }
+            )
+        return check_result
+
+    def _get_pending_result(self, config):
+        """Return the check result of a run waiting for its workflow."""
+        message = "Funding validation is in progress."
+        check_result = self._get_result(config, message=message, success=False)
+        # Informational only, so that the pending run is neither a pass nor a failure
+        check_result.errors[0]["severity"] = "info"
+        return check_result
+
+    def complete(self, config, input_hash, response):
+        """Return the result and state of a run from its workflow response."""
+        match = response.get("match")
+        if match is not None:
+            return self._get_result(config, response.get("message"), match), {
+                "input_hash": input_hash,
+                "workflow_id": response.get("workflow_id"),
+            }
+        return self._get_result(
+            config,
+            message="Funding validation service timed out, please try again.",
+            success=False,
+        ), {}
+
+    def run(self, record, config: CheckConfig, **kwargs):
+        """Run the funding relevance check on a record with the given configuration.
 
+        With ``ZENODO_FUNDING_CHECK_ASYNC``, the LLM workflow is only triggered and
+        the run stores an "in progress" result, with the workflow ID in its state. The
+        ``complete_funding_check_runs`` task then completes the run when the
+        workflow is done, so that the worker is not blocked while it runs.
+        """
         community = current_communities.service.record_cls.get_record(config.community_id)
         award_descriptions = self._get_awards_description(record, community)
 
         is_ec_community = community.slug == "eu"
         no_ec_requests = self._get_ec_requests(record, community).total == 0
         if is_ec_community and no_ec_requests:
-            return get_updated_result(
-                check_result,
+            return self._get_result(
+                config,
                 message="Skipping EOR funding check run, as there is no open request to the community.",
                 success=False,
             ), {}
@@ -169,38 +206,40 @@ class FundingCheck(Check):
         input_hash = self._get_input_hash(check_metadata, award_descriptions)
 
         if not award_descriptions:
-            return get_updated_result(
-                check_result,
+            return self._get_result(
+                config,
                 message="No award found for the project or record.",
                 success=False,
             ), {"input_hash": input_hash}
         if len(award_descriptions) > 1:
-            return get_updated_result(
-                check_result,
+            return self._get_result(
+                config,
                 message="Multiple awards found for the project or record. The check will be skipped.",
                 success=False,
             ), {"input_hash": input_hash}
 
         try:
-            response = run_funding_relevance_workflow(check_metadata, award_descriptions[0])
+            if current_app.config["ZENODO_FUNDING_CHECK_ASYNC"]:
+                # The result of the same record and award may already be cached
+                key = get_funding_relevance_key(check_metadata, award_descriptions[0])
+                response = get_result(key)
+                if response is None:
+                    workflow_id = trigger_funding_relevance_workflow(
+                        check_metadata, award_descriptions[0]
+                    )
+                    return self._get_pending_result(config), {
+                        "input_hash": input_hash,
+                        "pending_workflow_id": workflow_id,
+                        "result_key": list(key),
+                    }
+            else:
+                response = run_funding_relevance_workflow(check_metadata, award_descriptions[0])
 
         except Exception:
-            return get_updated_result(
-                check_result,
+            return self._get_result(
+                config,
                 message="Funding validation service unavailable.",
                 success=False,
             ), {}
 
-        match = response.get("match")
-        if match is not None:
-            return get_updated_result(
-                check_result, response.get("message"), match
-            ), {
-                "input_hash": input_hash,
-                "workflow_id": response.get("workflow_id")
-            }
-        return get_updated_result(
-            check_result,
-            message="Funding validation service timed out, please try again.",
-            success=False,
-        ), {}
+        return self.complete(config, input_hash, response)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# Zenodo RDM is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Zenodo-specific checks tasks."""
+
+from datetime import datetime, timezone
+
+from celery import shared_task
+from flask import current_app
+from invenio_checks.models import CheckConfig, CheckRun, CheckRunStatus
+from invenio_db import db
+
+from zenodo_rdm.orcha.cache import set_result
+from zenodo_rdm.orcha.utils import get_funding_relevance_workflow_result
+
+from .funding import FundingCheck
+
+
+@shared_task(ignore_result=True)
+def complete_funding_check_runs():
+    """Complete the funding check runs waiting for their LLM workflow.
+
+    Runs whose workflow is not done within ``ZENODO_FUNDING_CHECK_TIMEOUT`` are
+    completed with a time out result.
+    """
+    check = FundingCheck()
+    now = datetime.now(timezone.utc)
+    cutoff = now - current_app.config["ZENODO_FUNDING_CHECK_TIMEOUT"]
+    pending_workflow_id = CheckRun.state["pending_workflow_id"].as_string()
+    runs = (
+        db.session.query(CheckRun, CheckRun.start_time < cutoff)
+        .join(CheckRun.config)
+        .filter(
+            CheckConfig.check_id == FundingCheck.id,
+            CheckRun.status == CheckRunStatus.COMPLETED,
+            pending_workflow_id.isnot(None),
+        )
+        .all()
+    )
+
+    completed = 0
+    for run, expired in runs:
+        workflow_id = run.state["pending_workflow_id"]
+        try:
+            response = get_funding_relevance_workflow_result(workflow_id)
+        except Exception:
+            current_app.logger.exception(
+                "Failed to get funding relevance workflow",
+                extra={"check_run_id": str(run.id), "workflow_id": workflow_id},
+            )
+            response = None
+        if response is None:
+            if not expired:
+                continue
+            response = {}
+
+        if "result_key" in run.state:
+            set_result(tuple(run.state["result_key"]), response)
+        result, state = check.complete(run.config, run.state["input_hash"], response)
+        # Write only while the run waits for the same workflow, since the check
+        # might have run again in the meantime.
+        completed += (
+            db.session.query(CheckRun)
+            .filter(
+                CheckRun.id == run.id,
+                CheckRun.status == CheckRunStatus.COMPLETED,
+                pending_workflow_id == workflow_id,
+            )
+            .update(
+                {
+                    "state": state,
+                    "result": result.to_dict(),
+                    "end_time": datetime.now(timezone.utc),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.session.commit()
+
+    if completed:
+        current_app.logger.info(
+            "Completed funding check runs", extra={"check_run_count": completed}
+        )
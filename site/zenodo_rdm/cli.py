@@ -3,8 +3,10 @@
 """Zenodo RDM cli commands."""
 
 import csv
+from itertools import chain
 
 import click
+from flask import current_app
 from flask.cli import with_appcontext
 from invenio_access.permissions import system_identity
 from invenio_communities.communities.records.api import Community
@@ -25,12 +27,18 @@ from invenio_requests.records.api import Request
 from invenio_requests.records.models import RequestMetadata
 
 from zenodo_rdm.api import ZenodoRDMRecord
+from zenodo_rdm.moderation.domains import bump_domains_version
 from zenodo_rdm.moderation.models import LinkDomain, LinkDomainStatus, ModerationQuery
 from zenodo_rdm.moderation.percolator import (
+    bulk_index_percolate_queries,
     create_percolator_index,
     get_percolator_index,
     index_percolate_query,
+    rebuild_percolator_index,
 )
+from zenodo_rdm.moderation.rescore import rescore_records
+from zenodo_rdm.orcha.cache import get_stats, purge_expired
+from zenodo_rdm.stats.utils import chunkify
 
 
 def _get_parent(record_model):
@@ -255,6 +263,33 @@ def delete_record(recid):
         current_requests_service.indexer.delete(req)
 
 
+@zenodo_admin.command("funding-relevance-cache")
+@click.option(
+    "--purge-expired",
+    "purge",
+    is_flag=True,
+    default=False,
+    help="Delete the cached results older than the cache TTL.",
+)
+@with_appcontext
+def funding_relevance_cache(purge):
+    """Show the hit rate of the funding relevance result cache."""
+    stats = get_stats()
+    hit_rate = stats["hit_rate"]
+    click.echo(f"Hits: {stats['hits']}")
+    click.echo(f"Misses: {stats['misses']}")
+    click.echo(f"Hit rate: {hit_rate:.1%}" if hit_rate is not None else "Hit rate: -")
+    if purge:
+        count = purge_expired()
+        db.session.commit()
+        click.secho(f"Deleted {count} expired results.", fg="green")
+
+
+def _get_record_cls(name):
+    """Return the record class of a moderation percolator index by its name."""
+    return ZenodoRDMRecord if name == "records" else Community
+
+
 @click.group()
 def moderation_cli():
     """Moderation commands."""
@@ -276,7 +311,7 @@ def queries_cli():
 @with_appcontext
 def create_index(record_cls):
     """Command to create a percolator index for moderation queries."""
-    record_cls = ZenodoRDMRecord if record_cls == "records" else Community
+    record_cls = _get_record_cls(record_cls)
 
     try:
         create_percolator_index(record_cls)
@@ -327,8 +362,6 @@ def create_index(record_cls):
 @with_appcontext
 def add_query(record_cls, query_string, notes, score, active, file):
     """Command to add a moderation query from CSV or directly and index it."""
-    record_cls = ZenodoRDMRecord if record_cls == "records" else Community
-
     if file:
         _add_queries_from_csv(file, record_cls)
     else:
@@ -336,8 +369,9 @@ def add_query(record_cls, query_string, notes, score, active, file):
     click.secho("Queries added and indexed successfully.", fg="green")
 
 
-def _add_queries_from_csv(file_path, record_cls=ZenodoRDMRecord):
+def _add_queries_from_csv(file_path, record_cls="records"):
     """Load queries from a CSV file, add them to the database, and index them."""
+    entries = []
     with open(file_path, mode="r", newline="", encoding="utf-8") as csvfile:
         csvreader = csv.reader(csvfile)
 
@@ -352,19 +386,127 @@ def _add_queries_from_csv(file_path, record_cls=ZenodoRDMRecord):
 
                 # Ensure to add query only if there's a query string
                 if query_string:
-                    _create_and_index_query(
-                        record_cls, query_string, notes, score, active
+                    entries.append(
+                        {
+                            "query_string": query_string,
+                            "notes": notes,
+                            "score": score,
+                            "active": active,
+                            "record_cls": record_cls,
+                        }
                     )
 
+    bulk_size = current_app.config["MODERATION_BULK_SIZE"]
+    query_ids = []
+    for chunk in chunkify(entries, bulk_size):
+        query_ids.extend(ModerationQuery.bulk_create(chunk))
+    db.session.commit()
+
+    queries = chain.from_iterable(
+        ModerationQuery.query.filter(ModerationQuery.id.in_(chunk))
+        for chunk in chunkify(query_ids, bulk_size)
+    )
+    bulk_index_percolate_queries(_get_record_cls(record_cls), queries)
+
 
 def _create_and_index_query(record_cls, query_string, notes, score, active):
     """Create and index a single moderation query."""
     query = ModerationQuery.create(
-        query_string=query_string, notes=notes, score=score, active=active
+        query_string=query_string,
+        notes=notes,
+        score=score,
+        active=active,
+        record_cls=record_cls,
     )
 
     db.session.commit()
-    index_percolate_query(record_cls, query.id, query_string, active, score, notes)
+    index_percolate_query(
+        _get_record_cls(record_cls), query.id, query_string, active, score, notes
+    )
+
+
+@queries_cli.command("sync")
+@click.option(
+    "-r",
+    "--record-cls",
+    type=click.Choice(["records", "communities"], case_sensitive=False),
+    default="records",
+    help="Record class of the percolator index (default: records).",
+)
+@with_appcontext
+def sync_queries(record_cls):
+    """Command to rebuild the percolator index from the moderation queries.
+
+    Only the queries of the given record class are indexed. Queries without a
+    record class could belong to either index, so the index is not rebuilt while
+    there are any.
+    """
+    unassigned = ModerationQuery.query.filter(
+        ModerationQuery.record_cls.is_(None)
+    ).count()
+    if unassigned:
+        raise click.ClickException(
+            f"{unassigned} moderation queries have no record class. Set their "
+            "'record_cls' to 'records' or 'communities' before syncing."
+        )
+
+    queries = (
+        ModerationQuery.query.filter(ModerationQuery.record_cls == record_cls)
+        .order_by(ModerationQuery.id)
+        .yield_per(current_app.config["MODERATION_BULK_SIZE"])
+    )
+    index_name = rebuild_percolator_index(_get_record_cls(record_cls), queries)
+    click.secho(f"Percolator index '{index_name}' rebuilt successfully.", fg="green")
+
+
+@moderation_cli.command("rescore")
+@click.option("-q", "--query", help="Query string of the records to re-score.")
+@click.option(
+    "--since",
+    type=click.DateTime(),
+    help="Re-score records created since this date.",
+)
+@click.option(
+    "--until",
+    type=click.DateTime(),
+    help="Re-score records created before this date.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(writable=True, dir_okay=False),
+    required=True,
+    help="Path of the CSV report with the new scores.",
+)
+@click.option(
+    "-p",
+    "--previous",
+    type=click.Path(exists=True, readable=True, dir_okay=False),
+    help="Path of a previous report, to compute the score differences.",
+)
+@click.option(
+    "--apply",
+    "apply_actions",
+    multiple=True,
+    type=click.Choice(["block", "moderate", "approve"], case_sensitive=False),
+    help="Run the moderation handlers again for records with this action.",
+)
+@click.option("--batch-size", default=500, type=int, help="Records per batch.")
+@click.option("-w", "--workers", default=4, type=int, help="Number of workers.")
+@with_appcontext
+def rescore(query, since, until, output, previous, apply_actions, batch_size, workers):
+    """Re-calculate the moderation scores of published records."""
+    count = rescore_records(
+        output,
+        query=query,
+        since=since,
+        until=until,
+        previous_report=previous,
+        apply_actions=apply_actions,
+        batch_size=batch_size,
+        workers=workers,
+    )
+    click.secho(f"{count} records re-scored, report written to {output}.", fg="green")
 
 
 @moderation_cli.group("domains")
@@ -397,6 +539,8 @@ def add_domain(domain, notes, status, score, file):
         _add_domains_from_csv(file)
     else:
         _create_domain(domain, notes, score, status)
+    # Reload the domains used for moderation in all processes
+    bump_domains_version()
 
 
 def _create_domain(domain, notes, score, status):
@@ -409,11 +553,26 @@ def _create_domain(domain, notes, score, status):
 
 def _add_domains_from_csv(file_path):
     """Load domains from a CSV file, add them to the database."""
+    entries = []
     with open(file_path, mode="r", encoding="utf-8") as csvfile:
         reader = csv.DictReader(csvfile)
         for entry in reader:
-            domain = entry["domain"].strip()
-            notes = entry.get("notes", None)
-            score = entry.get("score") or None
             status = entry.get("status", "banned")
-            _create_domain(domain, notes, score, status)
+            score = entry.get("score") or None
+            entries.append(
+                {
+                    "domain": entry["domain"].strip(),
+                    "status": (
+                        LinkDomainStatus.BANNED
+                        if status == "banned"
+                        else LinkDomainStatus.SAFE
+                    ),
+                    "score": int(score) if score is not None else None,
+                    "reason": entry.get("notes", None),
+                }
+            )
+
+    for chunk in chunkify(entries, current_app.config["MODERATION_BULK_SIZE"]):
+        LinkDomain.bulk_upsert(chunk)
+    db.session.commit()
+    click.secho(f"{len(entries)} domains added successfully.", fg="green")
@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Custom code config."""
 
+from datetime import timedelta
+
 from invenio_administration.permissions import administration_permission
 from invenio_search.api import dsl
 
@@ -198,6 +200,28 @@ ZENODO_FRONTPAGE_RECENT_UPLOADS_QUERY = dsl.query.Bool(
 ZENODO_FRONTPAGE_CACHE_TIMEOUT = 60 * 30
 
 
+# Funding check
+# =============
+ZENODO_FUNDING_CHECK_ASYNC = False
+"""Complete the funding checks without waiting for their LLM workflow.
+
+The workflow of a funding check run is only triggered by the check worker, and
+the ``complete_funding_check_runs`` task (scheduled by Celery beat) polls the
+pending workflows and completes their runs. Until then, the run is completed
+with an informational "in progress" result.
+"""
+
+ZENODO_FUNDING_CHECK_TIMEOUT = timedelta(minutes=10)
+"""Time after which a funding check workflow that is not done times out."""
+
+ZENODO_FUNDING_RELEVANCE_CACHE_TTL = timedelta(days=30)
+"""Time for which the result of a funding relevance workflow is reused.
+
+Results are reused by the funding checks of all communities and by the EU
+curation, for the same record title and description, award and LLM rule.
+"""
+
+
 # Citations
 # =========
 ZENODO_RECORDS_UI_CITATIONS_ENDPOINT = (
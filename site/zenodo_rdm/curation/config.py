@@ -69,6 +69,9 @@ CURATION_THRESHOLDS = {"EU_RECORDS_CURATION": 100}
 CURATION_ENABLE_EU_CURATOR = False
 """Controls whether to dry run EU Curation."""
 
+CURATION_EU_CHUNK_SIZE = 100
+"""Number of records curated by each EU Curation subtask."""
+
 CURATION_LOW_CONF_KEYWORDS_EU = []
 """Low confidence keywords for EU records."""
 
@@ -78,5 +81,12 @@ CURATION_HIGH_CONF_KEYWORDS_EU = []
 CURATION_TEST_PHRASES = []
 """Test record phrases."""
 
+CURATION_KEYWORD_HITS_CAP = 1
+"""Maximum number of keywords counted by keyword rules.
+
+The score of a keyword rule is multiplied by the number of distinct keywords
+found, up to this number. With 1, keyword rules score like boolean rules.
+"""
+
 CURATION_FUNDING_RELEVANCE_RULE = ""
 """Instructions passed to the LLM for the funding relevance check."""
@@ -0,0 +1,268 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Curation context shared by the rules evaluated for a record."""
+
+from collections import defaultdict
+
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_communities.proxies import current_communities
+from invenio_rdm_records.requests import CommunityInclusion, CommunitySubmission
+from invenio_records_resources.proxies import current_service_registry
+from invenio_requests.proxies import current_requests_service
+from invenio_search.engine import dsl
+from werkzeug.utils import cached_property
+
+from zenodo_rdm.orcha.cache import get_result, set_result
+from zenodo_rdm.orcha.utils import (
+    get_funding_relevance_key,
+    trigger_funding_relevance_workflow,
+    wait_for_funding_relevance_workflows,
+)
+
+EC_FUNDER_ID = "00k4n6c32"
+
+
+class AwardCache:
+    """Resolved awards, shared by all the records of a curation run."""
+
+    def __init__(self):
+        """Constructor."""
+        self._awards = {}
+
+    def get(self, award_id):
+        """Return a resolved award."""
+        if award_id not in self._awards:
+            award_service = current_service_registry.get("awards")
+            self._awards[award_id] = award_service.record_cls.pid.resolve(award_id)
+        return self._awards[award_id]
+
+
+def get_ec_awards(record, awards):
+    """Return the resolved EC funded awards of a record."""
+    ec_awards = []
+    for f in record.metadata.get("funding", []):
+        if f["funder"].get("id") == EC_FUNDER_ID:
+            if award_id := f.get("award", {}).get("id"):
+                ec_awards.append(awards.get(award_id))
+    return ec_awards
+
+
+class CommunityRequests:
+    """Community inclusion and submission requests of a batch of records.
+
+    The requests of all records are fetched with one search, and the parents of
+    their receiving communities with one database query.
+    """
+
+    def __init__(self, requests, community_parents):
+        """Constructor."""
+        self._requests = requests
+        self._community_parents = community_parents
+
+    @classmethod
+    def fetch(cls, record_ids):
+        """Fetch the requests of records, by record PID value."""
+        query = dsl.Q(
+            "bool",
+            must=[
+                dsl.Q("terms", **{"topic.record": list(record_ids)}),
+                dsl.Q(
+                    "terms",
+                    type=[CommunityInclusion.type_id, CommunitySubmission.type_id],
+                ),
+            ],
+        )
+        requests = defaultdict(list)
+        for result in current_requests_service.scan(
+            system_identity, extra_filter=query
+        ):
+            requests[result["topic"]["record"]].append(result)
+
+        community_ids = {
+            result["receiver"]["community"]
+            for results in requests.values()
+            for result in results
+        }
+        community_parents = {}
+        if community_ids:
+            communities = current_communities.service.record_cls.get_records(
+                community_ids
+            )
+            # The parent IDs are read from the models, without resolving the parents
+            community_parents = {
+                str(community.id): (
+                    str(community.model.parent_id)
+                    if community.model.parent_id
+                    else None
+                )
+                for community in communities
+            }
+
+        # Records without requests have an empty list
+        requests = {record_id: requests[record_id] for record_id in record_ids}
+        return cls(requests, community_parents)
+
+    def __contains__(self, record_id):
+        """Whether the requests of a record were fetched."""
+        return record_id in self._requests
+
+    def for_record(self, record_id):
+        """Return the requests of a record."""
+        return self._requests[record_id]
+
+    def community_parent(self, community_id):
+        """Return the ID of the parent of a receiving community, if any."""
+        return self._community_parents.get(community_id)
+
+
+class FundingRelevance:
+    """Funding relevance LLM workflow results of a batch of records.
+
+    The workflows of all the EC awards of all records are triggered at once, and
+    then polled together, instead of waiting for each workflow in turn.
+    """
+
+    def __init__(self, results):
+        """Constructor."""
+        self._results = results
+
+    @classmethod
+    def fetch(cls, records, awards, rule=""):
+        """Run the workflows of records, by record PID value.
+
+        Results found in the result cache are reused instead of running their
+        workflow again.
+        """
+        keys = {}
+        results = {}
+        workflow_ids = {}
+        for record in records:
+            metadata = {
+                "title": record.metadata.get("title", ""),
+                "description": record.metadata.get("description", ""),
+            }
+            try:
+                record_keys = []
+                for award in get_ec_awards(record, awards):
+                    award_description = award.get("description", {}).get("en")
+                    key = get_funding_relevance_key(metadata, award_description, rule)
+                    record_keys.append(key)
+                    if key in results or key in workflow_ids:
+                        continue
+                    result = get_result(key)
+                    if result is not None:
+                        results[key] = result
+                    else:
+                        workflow_ids[key] = trigger_funding_relevance_workflow(
+                            metadata, award_description, rule
+                        )
+                keys[record.pid.pid_value] = record_keys
+            except Exception:
+                # Left out, so that the rule of the record fails on its own
+                current_app.logger.exception(
+                    "Failed to trigger funding relevance workflows",
+                    extra={"record_id": record.pid.pid_value},
+                )
+
+        workflow_results = wait_for_funding_relevance_workflows(
+            list(workflow_ids.values())
+        )
+        for key, workflow_id in workflow_ids.items():
+            results[key] = workflow_results[workflow_id]
+            set_result(key, results[key])
+
+        return cls(
+            {
+                record_id: [results[key] for key in record_keys]
+                for record_id, record_keys in keys.items()
+            }
+        )
+
+    def __contains__(self, record_id):
+        """Whether the workflows of a record were run."""
+        return record_id in self._results
+
+    def for_record(self, record_id):
+        """Return the workflow results of a record, one per EC award."""
+        return self._results[record_id]
+
+
+class CurationContext:
+    """Data of a record derived once, and used by all curation rules."""
+
+    def __init__(
+        self, record, awards=None, community_requests=None, funding_relevance=None
+    ):
+        """Constructor."""
+        self.record = record
+        self._awards = awards if awards is not None else AwardCache()
+        self._community_requests = community_requests
+        self._funding_relevance = funding_relevance
+
+    @cached_property
+    def community_requests(self):
+        """Community requests of the batch, including the record's."""
+        record_id = self.record.pid.pid_value
+        if self._community_requests is None or record_id not in (
+            self._community_requests
+        ):
+            return CommunityRequests.fetch([record_id])
+        return self._community_requests
+
+    @cached_property
+    def requests(self):
+        """Community inclusion and submission requests of the record."""
+        return self.community_requests.for_record(self.record.pid.pid_value)
+
+    @cached_property
+    def ec_awards(self):
+        """EC funded awards of the record."""
+        return get_ec_awards(self.record, self._awards)
+
+    @cached_property
+    def funding_relevance(self):
+        """Funding relevance LLM workflow results of the record's EC awards."""
+        record_id = self.record.pid.pid_value
+        funding_relevance = self._funding_relevance
+        if funding_relevance is None or record_id not in funding_relevance:
+            funding_relevance = FundingRelevance.fetch(
+                [self.record],
+                self._awards,
+                current_app.config.get("CURATION_FUNDING_RELEVANCE_RULE"),
+            )
+        return funding_relevance.for_record(record_id)
+
+    @cached_property
+    def title(self):
+        """Lowercased title."""
+        return self.record.metadata["title"].lower()
+
+    @cached_property
+    def description(self):
+        """Lowercased description."""
+        return (self.record.metadata.get("description") or "").lower()
+
+    @cached_property
+    def text(self):
+        """Lowercased title and description."""
+        return f"{self.title} {self.description}"
+
+    @cached_property
+    def additional_descriptions(self):
+        """Lowercased additional descriptions."""
+        additional_descriptions = self.record.metadata.get(
+            "additional_descriptions", []
+        )
+        return " ".join(
+            x.get("description", "") for x in additional_descriptions
+        ).lower()
+
+    @cached_property
+    def communities_text(self):
+        """Lowercased titles and pages of the record's communities."""
+        comm_text = ""
+        for comm in self.record.parent.communities:
+            comm_text += comm.metadata.get("title", "")
+            comm_text += " " + comm.metadata.get("page", "")
+        return comm_text.lower()
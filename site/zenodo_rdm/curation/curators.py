@@ -7,6 +7,12 @@ from invenio_access.permissions import system_identity
 from invenio_rdm_records.proxies import current_record_communities_service
 from invenio_records_resources.services.uow import UnitOfWork
 
+from zenodo_rdm.curation.context import (
+    AwardCache,
+    CommunityRequests,
+    CurationContext,
+    FundingRelevance,
+)
 from zenodo_rdm.curation.proxies import current_curation
 
 
@@ -16,6 +22,22 @@ class BaseCurator:
     def __init__(self, dry=False):
         """Constructor."""
         self.dry = dry
+        # Awards resolved for a record are reused for all records of the run
+        self.awards = AwardCache()
+        self.community_requests = None
+        self.funding_relevance = None
+
+    def prefetch(self, records):
+        """Fetch the data used by rules for a batch of records at once."""
+        self.community_requests = CommunityRequests.fetch(
+            [record.pid.pid_value for record in records]
+        )
+        if "check_funding_relevance_llm_workflow" in self.rules:
+            self.funding_relevance = FundingRelevance.fetch(
+                records,
+                self.awards,
+                current_app.config.get("CURATION_FUNDING_RELEVANCE_RULE"),
+            )
 
     def _evaluator(self, results):
         """Evaluates final result for based on results dict."""
@@ -28,10 +50,16 @@ class BaseCurator:
 
     def run(self, record, raise_rule_exc=False):
         """Run rules for the curator and evaluate result."""
+        ctx = CurationContext(
+            record,
+            awards=self.awards,
+            community_requests=self.community_requests,
+            funding_relevance=self.funding_relevance,
+        )
         rule_results = {}
         for name, rule in self.rules.items():
             try:
-                rule_results[name] = rule(record)
+                rule_results[name] = rule(record, ctx)
             except Exception as e:
                 if raise_rule_exc:
                     raise e
@@ -58,7 +86,12 @@ class EURecordCurator(BaseCurator):
             if result is None:
                 continue
             elif type(rule_score) is int:
-                score += rule_score if result else 0
+                if type(result) is int:
+                    # Graded results (e.g. keyword counts) are capped
+                    cap = current_app.config["CURATION_KEYWORD_HITS_CAP"]
+                    score += rule_score * min(result, cap)
+                else:
+                    score += rule_score if result else 0
             elif isinstance(rule_score, bool):
                 if result:
                     return rule_score
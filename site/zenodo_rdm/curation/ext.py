@@ -6,6 +6,7 @@ from flask import current_app
 from werkzeug.utils import cached_property
 
 from . import config
+from .matcher import KeywordMatcher
 
 
 class ZenodoCuration:
@@ -43,3 +44,15 @@ class ZenodoCuration:
             **config.CURATION_THRESHOLDS,
             **current_app.config.get("CURATION_THRESHOLDS", {}),
         }
+
+    @cached_property
+    def keyword_matchers(self):
+        """Return the keyword matchers used for rules, by keywords config."""
+        return {
+            key: KeywordMatcher(current_app.config.get(key, []))
+            for key in (
+                "CURATION_TEST_PHRASES",
+                "CURATION_LOW_CONF_KEYWORDS_EU",
+                "CURATION_HIGH_CONF_KEYWORDS_EU",
+            )
+        }
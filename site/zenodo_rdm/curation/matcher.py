@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Keyword matching for curation rules."""
+
+import re
+from collections import namedtuple
+
+KeywordHit = namedtuple("KeywordHit", ["keyword", "start"])
+
+
+class KeywordMatcher:
+    """Find any of a set of keywords in a text, in a single pass.
+
+    The keywords are compiled into one alternation, longest keywords first, so
+    that a keyword that contains another one is matched as a whole. Keywords are
+    matched case-insensitively anywhere in the text (not only as whole words).
+    """
+
+    def __init__(self, keywords):
+        """Constructor."""
+        keywords = sorted({k.lower() for k in keywords if k}, key=len, reverse=True)
+        self._pattern = (
+            re.compile("|".join(re.escape(k) for k in keywords)) if keywords else None
+        )
+
+    def find(self, text):
+        """Return the hits of the keywords in a lowercased text.
+
+        Hits never overlap: of overlapping keywords (e.g. "horizon 2020" and
+        "2020 grant" in "horizon 2020 grant"), only the first one is reported.
+        Graded scores counting the keywords are then lower than the number of
+        keywords in the text, once ``CURATION_KEYWORD_HITS_CAP`` is above 1.
+        """
+        if self._pattern is None:
+            return []
+        return [KeywordHit(m.group(), m.start()) for m in self._pattern.finditer(text)]
+
+    def count(self, text):
+        """Return the number of distinct keywords in a lowercased text."""
+        return len({hit.keyword for hit in self.find(text)})
@@ -4,91 +4,59 @@
 
 import arrow
 from flask import current_app
-from invenio_access.permissions import system_identity
-from invenio_communities.proxies import current_communities
-from invenio_rdm_records.requests import CommunityInclusion, CommunitySubmission
-from invenio_records_resources.proxies import current_service_registry
-from invenio_requests.proxies import current_requests_service
-from invenio_search.engine import dsl
 
-from zenodo_rdm.orcha.utils import run_funding_relevance_workflow
+from zenodo_rdm.curation.proxies import current_curation
 
 
 def _award_acronym_in_text(award, text):
-    """Check for award acronym in data."""
-    if award.get("acronym") and (award.get("acronym").lower() in text.lower()):
+    """Check for award acronym in lowercased data."""
+    if award.get("acronym") and (award.get("acronym").lower() in text):
         return True
     return False
 
 
 def _award_number_in_text(award, text):
-    """Check for award number in data."""
-    if award.get("number") and (str(award.get("number")) in text):
+    """Check for award number in lowercased data."""
+    if award.get("number") and (str(award.get("number")).lower() in text):
         return True
     return False
 
 
-def _get_ec_awards(record):
-    """Get all EC funded awards of record."""
-    award_service = current_service_registry.get("awards")
-    awards = []
-    funding = record.metadata.get("funding", [])
-    for f in funding:
-        if f["funder"].get("id") == "00k4n6c32":
-            if award_id := f.get("award", {}).get("id"):
-                award = award_service.record_cls.pid.resolve(award_id)
-                awards.append(award)
-    return awards
-
-
-def award_acronym_in_description(record):
+def award_acronym_in_description(record, ctx):
     """Check if EU award name in record description."""
-    if description := record.metadata.get("description"):
-        awards = _get_ec_awards(record)
-        for award in awards:
-            if _award_acronym_in_text(award, description):
+    if ctx.description:
+        for award in ctx.ec_awards:
+            if _award_acronym_in_text(award, ctx.description):
                 return True
     return False
 
 
-def award_number_in_description(record):
+def award_number_in_description(record, ctx):
     """Check if EU award number in record description."""
-    if description := record.metadata.get("description"):
-        awards = _get_ec_awards(record)
-        for award in awards:
-            if _award_number_in_text(award, description):
+    if ctx.description:
+        for award in ctx.ec_awards:
+            if _award_number_in_text(award, ctx.description):
                 return True
     return False
 
 
-def award_acronym_in_title(record):
+def award_acronym_in_title(record, ctx):
     """Check if EU award name in record title."""
-    title = record.metadata["title"]
-
-    awards = _get_ec_awards(record)
-    for award in awards:
-        if _award_acronym_in_text(award, title):
+    for award in ctx.ec_awards:
+        if _award_acronym_in_text(award, ctx.title):
             return True
     return False
 
 
-def test_phrases_in_record(record):
+def test_phrases_in_record(record, ctx):
     """Check if test words in record."""
-    test_phrases = current_app.config.get("CURATION_TEST_PHRASES")
-    record_data = (
-        record.metadata["title"] + " " + record.metadata.get("description", "")
-    )
+    matcher = current_curation.keyword_matchers["CURATION_TEST_PHRASES"]
+    return matcher.count(ctx.text) > 0
 
-    for word in test_phrases:
-        if word.lower() in record_data.lower():
-            return True
-    return False
 
-
-def published_before_award_start(record):
+def published_before_award_start(record, ctx):
     """Check if published before award start date."""
-    awards = _get_ec_awards(record)
-    for award in awards:
+    for award in ctx.ec_awards:
         if award.get("start_date") and (
             record.created.timestamp()
             < arrow.get(award.get("start_date")).datetime.timestamp()
@@ -97,7 +65,7 @@ def published_before_award_start(record):
     return False
 
 
-def user_verified(record):
+def user_verified(record, ctx):
     """Check if user is verified."""
     is_verified = (
         getattr(record.parent, "is_verified", None)
@@ -107,108 +75,52 @@ def user_verified(record):
     return is_verified
 
 
-def contains_low_conf_keywords(record):
-    """Check if record contains low confidence keywords."""
-    low_conf_keywords_eu = current_app.config.get("CURATION_LOW_CONF_KEYWORDS_EU")
-    record_data = (
-        record.metadata["title"] + " " + record.metadata.get("description", "")
-    )
-
-    for word in low_conf_keywords_eu:
-        # TODO could possibly return a number for higher conf
-        if word.lower() in record_data.lower():
-            return True
-    return False
-
-
-def contains_high_conf_keywords(record):
-    """Check if record contains high confidence keywords."""
-    high_conf_keywords_eu = current_app.config.get("CURATION_HIGH_CONF_KEYWORDS_EU")
-    record_data = (
-        record.metadata["title"] + " " + record.metadata.get("description", "")
-    )
-
-    for word in high_conf_keywords_eu:
-        # TODO could possibly return a number for higher conf
-        if word.lower() in record_data.lower():
-            return True
-    return False
+def contains_low_conf_keywords(record, ctx):
+    """Count the low confidence keywords in the record."""
+    matcher = current_curation.keyword_matchers["CURATION_LOW_CONF_KEYWORDS_EU"]
+    return matcher.count(ctx.text)
 
 
-def additional_desc_contains_high_conf_keywords(record):
-    """Check if additional description contains high confidence keywords."""
-    high_conf_keywords_eu = current_app.config.get("CURATION_HIGH_CONF_KEYWORDS_EU")
-    additional_descriptions = record.metadata.get("additional_descriptions", [])
-    record_data = " ".join([x.get("description", "") for x in additional_descriptions])
+def contains_high_conf_keywords(record, ctx):
+    """Count the high confidence keywords in the record."""
+    matcher = current_curation.keyword_matchers["CURATION_HIGH_CONF_KEYWORDS_EU"]
+    return matcher.count(ctx.text)
 
-    for word in high_conf_keywords_eu:
-        # TODO could possibly return a number for higher conf
-        if word.lower() in record_data.lower():
-            return True
-    return False
 
+def additional_desc_contains_high_conf_keywords(record, ctx):
+    """Count the high confidence keywords in the additional descriptions."""
+    matcher = current_curation.keyword_matchers["CURATION_HIGH_CONF_KEYWORDS_EU"]
+    return matcher.count(ctx.additional_descriptions)
 
-def additional_desc_contains_low_conf_keywords(record):
-    """Check if additional description contains low confidence keywords."""
-    low_conf_keywords_eu = current_app.config.get("CURATION_LOW_CONF_KEYWORDS_EU")
-    additional_descriptions = record.metadata.get("additional_descriptions", [])
-    record_data = " ".join([x.get("description", "") for x in additional_descriptions])
 
-    for word in low_conf_keywords_eu:
-        # TODO could possibly return a number for higher conf
-        if word.lower() in record_data.lower():
-            return True
-    return False
+def additional_desc_contains_low_conf_keywords(record, ctx):
+    """Count the low confidence keywords in the additional descriptions."""
+    matcher = current_curation.keyword_matchers["CURATION_LOW_CONF_KEYWORDS_EU"]
+    return matcher.count(ctx.additional_descriptions)
 
 
-def award_acronym_in_additional_description(record):
+def award_acronym_in_additional_description(record, ctx):
     """Check if EU award name in record additional description."""
-    additional_descriptions = record.metadata.get("additional_descriptions", [])
-    record_data = " ".join([x.get("description", "") for x in additional_descriptions])
-
-    awards = _get_ec_awards(record)
-    for award in awards:
-        if _award_acronym_in_text(award, record_data):
+    for award in ctx.ec_awards:
+        if _award_acronym_in_text(award, ctx.additional_descriptions):
             return True
     return False
 
 
-def award_number_in_additional_description(record):
+def award_number_in_additional_description(record, ctx):
     """Check if EU award number in record additional description."""
-    additional_descriptions = record.metadata.get("additional_descriptions", [])
-    record_data = " ".join([x.get("description", "") for x in additional_descriptions])
-
-    awards = _get_ec_awards(record)
-    for award in awards:
-        if _award_number_in_text(award, record_data):
+    for award in ctx.ec_awards:
+        if _award_number_in_text(award, ctx.additional_descriptions):
             return True
     return False
 
 
-def eu_community_request(record):
+def eu_community_request(record, ctx):
     """Check if record was rejected from EU community."""
-    community_requests = dsl.Q(
-        "bool",
-        must=[
-            dsl.Q(
-                "term",
-                **{"receiver.community": current_app.config.get("EU_COMMUNITY_UUID")},
-            ),
-            dsl.Q("term", **{"topic.record": record.pid.pid_value}),
-        ],
-    )
-    request_types = dsl.Q(
-        "bool",
-        should=[
-            dsl.Q("term", **{"type": CommunityInclusion.type_id}),
-            dsl.Q("term", **{"type": CommunitySubmission.type_id}),
-        ],
-        minimum_should_match=1,
-    )
-    finalq = community_requests & request_types
-    results = current_requests_service.search(system_identity, extra_filter=finalq)
-
-    for result in results:
+    eu_community_id = current_app.config.get("EU_COMMUNITY_UUID")
+    for result in ctx.requests:
+        if result["receiver"]["community"] != eu_community_id:
+            continue
         # return true if there was a declined request or an existing open request
         # as we respond to open requests ourselves.
         if result["is_closed"] and result["status"] == "declined":
@@ -218,65 +130,32 @@ def eu_community_request(record):
     return False
 
 
-def eu_subcommunity_declined_request(record):
+def eu_subcommunity_declined_request(record, ctx):
     """Check if record was rejected from EU sub community."""
-    record_requests = dsl.Q(
-        "bool",
-        must=[
-            dsl.Q("term", **{"topic.record": record.pid.pid_value}),
-            dsl.Q("term", **{"is_open": False}),
-        ],
-    )
-    request_types = dsl.Q(
-        "bool",
-        should=[
-            dsl.Q("term", **{"type": CommunityInclusion.type_id}),
-            dsl.Q("term", **{"type": CommunitySubmission.type_id}),
-        ],
-        minimum_should_match=1,
-    )
-    finalq = record_requests & request_types
-    results = current_requests_service.search(system_identity, extra_filter=finalq)
-
-    for result in results:
-        community = current_communities.service.record_cls.pid.resolve(
+    eu_community_id = current_app.config.get("EU_COMMUNITY_UUID")
+    for result in ctx.requests:
+        if result["is_open"]:
+            continue
+        parent_id = ctx.community_requests.community_parent(
             result["receiver"]["community"]
         )
-        if community.parent and str(community.parent.id) == current_app.config.get(
-            "EU_COMMUNITY_UUID"
-        ):
-            if result["status"] == "declined":
-                return True
+        if parent_id == eu_community_id and result["status"] == "declined":
+            return True
     return False
 
 
-def community_data_award_acronym(record):
+def community_data_award_acronym(record, ctx):
     """Check if award acronym in community data."""
-    comm_text = ""
-    for comm in record.parent.communities:
-        comm_text += comm.metadata.get("title", "")
-        comm_text += " " + comm.metadata.get("page", "")
-
-    if comm_text:
-        awards = _get_ec_awards(record)
-        for award in awards:
-            if _award_acronym_in_text(award, comm_text):
+    if ctx.communities_text:
+        for award in ctx.ec_awards:
+            if _award_acronym_in_text(award, ctx.communities_text):
                 return True
     return False
 
 
-def check_funding_relevance_llm_workflow(record):
+def check_funding_relevance_llm_workflow(record, ctx):
     """Check funding relevance via the orcha LLM workflow."""
-    metadata = {
-        "title": record.metadata.get("title", ""),
-        "description": record.metadata.get("description", ""),
-    }
-    rule = current_app.config.get("CURATION_FUNDING_RELEVANCE_RULE")
-
-    awards = _get_ec_awards(record)
-    for award in awards:
-        award_description = award.get("description", {}).get("en")
-        response = run_funding_relevance_workflow(metadata, award_description, rule)
+    for response in ctx.funding_relevance:
         if response.get("match"):
             return True
     return False
@@ -4,14 +4,16 @@
 
 from datetime import datetime, timedelta, timezone
 
-from celery import shared_task
+from celery import chord, shared_task
 from flask import current_app
 from flask_mail import Message
 from invenio_access.permissions import system_identity
+from invenio_db import db
 from invenio_rdm_records.proxies import current_rdm_records_service as records_service
 from invenio_search.engine import dsl
 
 from zenodo_rdm.curation.curators import EURecordCurator
+from zenodo_rdm.stats.utils import chunkify
 
 RESULT_EMAIL_BODY = """
 EU Record Curation Processed
@@ -25,11 +27,21 @@ Record IDs Approved:
 {records_moved}
 """
 
+FAILED_EMAIL_BODY = """
+EU Record Curation Failed
 
-def _send_result_email(content):
+Finished at: {finished_at}
+Processed since: {since}
+Error: {error}
+
+The results of the curated records could not be collected.
+"""
+
+
+def _send_result_email(content, template=RESULT_EMAIL_BODY):
     """Send curation result as email."""
     subject = f"EU Record Curation Processed {datetime.now().date()}"
-    body = RESULT_EMAIL_BODY.format(finished_at=datetime.now(timezone.utc), **content)
+    body = template.format(finished_at=datetime.now(timezone.utc), **content)
     sender = current_app.config["MAIL_DEFAULT_SENDER"]
     admin_email = current_app.config["APP_RDM_ADMIN_EMAIL_RECIPIENT"]
     recipients = admin_email
@@ -105,27 +117,42 @@ def _get_eu_records_query(since):
 
 
 @shared_task
-def run_eu_record_curation(since):
-    """Run EC Curator."""
+def curate_eu_records(record_ids, dry_run):
+    """Run EC Curator on a chunk of records.
+
+    Failures are counted per record, so that the chunk always returns its
+    result to ``finish_eu_record_curation``.
+    """
     ctx = {
         "processed": 0,
         "approved": 0,
         "failed": 0,
-        "since": since,
         "records_moved": [],
     }
-    dry_run = not current_app.config.get("CURATION_ENABLE_EU_CURATOR")
     curator = EURecordCurator(dry=dry_run)
 
-    search = records_service.create_search(
-        system_identity,
-        records_service.record_cls,
-        records_service.config.search,
-        extra_filter=_get_eu_records_query(since),
-    )
+    records = []
+    for record_id in record_ids:
+        try:
+            records.append(records_service.record_cls.pid.resolve(record_id))
+        except Exception:
+            current_app.logger.exception(
+                "Failed to resolve record for EU curation",
+                extra={"record_id": record_id},
+            )
+            ctx["failed"] += 1
 
-    for item in search.scan():
-        record = records_service.record_cls.pid.resolve(item["id"])
+    # Community requests of all the records are fetched at once
+    try:
+        curator.prefetch(records)
+        # Keep the funding relevance results, even if the curation of a record fails
+        db.session.commit()
+    except Exception:
+        # Rules fetch the data of each record on their own instead
+        db.session.rollback()
+        current_app.logger.exception("Failed to prefetch EU curation data")
+
+    for record in records:
         try:
             result = curator.run(record=record)
             ctx["processed"] += 1
@@ -136,7 +163,27 @@ def run_eu_record_curation(since):
         except Exception:
             # NOTE Since curator's raise_rules_exc is by default false, rules would not fail.
             # This catches failures due to other reasons
+            db.session.rollback()
+            current_app.logger.exception(
+                "Failed to curate EU record",
+                extra={"record_id": record.pid.pid_value},
+            )
             ctx["failed"] += 1
+    return ctx
+
+
+@shared_task
+def finish_eu_record_curation(results, since, dry_run):
+    """Collect the results of the EC Curator chunks and report them."""
+    ctx = {
+        "processed": sum(r["processed"] for r in results),
+        "approved": sum(r["approved"] for r in results),
+        "failed": sum(r["failed"] for r in results),
+        "since": since,
+        "records_moved": [
+            record_id for r in results for record_id in r["records_moved"]
+        ],
+    }
 
     if not dry_run:
         _send_result_email(ctx)
@@ -145,3 +192,46 @@ def run_eu_record_curation(since):
         "EU curation processed",
         extra=ctx,
     )
+
+
+@shared_task
+def fail_eu_record_curation(request, exc, traceback, since, dry_run):
+    """Report an EU curation run whose results could not be collected."""
+    ctx = {"since": since, "error": repr(exc)}
+    if not dry_run:
+        _send_result_email(ctx, template=FAILED_EMAIL_BODY)
+
+    current_app.logger.error("EU curation failed", extra=ctx)
+
+
+@shared_task
+def run_eu_record_curation(since):
+    """Run EC Curator.
+
+    The records to curate are split into chunks of ``CURATION_EU_CHUNK_SIZE``,
+    curated in parallel by ``curate_eu_records`` tasks. Their results are
+    collected by ``finish_eu_record_curation``, once all chunks are done, or
+    reported by ``fail_eu_record_curation`` if a chunk fails altogether.
+    """
+    dry_run = not current_app.config.get("CURATION_ENABLE_EU_CURATOR")
+
+    search = records_service.create_search(
+        system_identity,
+        records_service.record_cls,
+        records_service.config.search,
+        extra_filter=_get_eu_records_query(since),
+    ).source(["id"])
+    record_ids = (item["id"] for item in search.scan())
+
+    chunk_size = current_app.config["CURATION_EU_CHUNK_SIZE"]
+    chunks = [
+        curate_eu_records.s(chunk, dry_run)
+        for chunk in chunkify(record_ids, chunk_size)
+    ]
+    callback = finish_eu_record_curation.s(since, dry_run).on_error(
+        fail_eu_record_curation.s(since, dry_run)
+    )
+    if chunks:
+        chord(chunks)(callback)
+    else:
+        callback.delay([])
@@ -2,21 +2,148 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Export records."""
 
+from datetime import datetime, timezone
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
 from flask import current_app
 from invenio_db import db
-from invenio_files_rest.models import Bucket, Location, ObjectVersion
+from invenio_files_rest.models import Bucket, Location, ObjectVersion, ObjectVersionTag
 
+from zenodo_rdm.exporter import parquet
+from zenodo_rdm.exporter.manifest import (
+    MANIFEST_KEY,
+    count_deltas,
+    high_water_mark,
+    load_manifest,
+    save_manifest,
+)
 from zenodo_rdm.exporter.readers import read_records
-from zenodo_rdm.exporter.writers import EXPORT_FORMATS, write_archives
+from zenodo_rdm.exporter.shards import write_sharded_archives
+from zenodo_rdm.exporter.uploads import stream_archives
+from zenodo_rdm.exporter.writers import EXPORT_FORMATS, archive_name, write_archives
 
 EXPORT_MIMETYPE = "application/gzip"
+PARQUET_MIMETYPE = "application/vnd.apache.parquet"
 
+# Tag storing the high-water mark of an object version, i.e. the time up to
+# which record changes are included in it.
+UNTIL_TAG = "until"
 
-def export_records(formats, community_slug):
-    """Export records to the configured bucket."""
+
+def _get_or_create_bucket():
+    """Return the exporter bucket, creating it on the first export."""
+    bucket_id = current_app.config["EXPORTER_BUCKET_UUID"]
+    bucket = Bucket.get(bucket_id)
+    if bucket:
+        current_app.logger.info(f"Exporter bucket found: {bucket_id}")
+        return bucket
+
+    current_app.logger.info(f"Creating exporter bucket: {bucket_id}")
+    bucket = Bucket(
+        id=bucket_id,
+        default_location=Location.get_default().id,
+        default_storage_class=current_app.config["FILES_REST_DEFAULT_STORAGE_CLASS"],
+    )
+    db.session.add(bucket)
+    db.session.commit()
+    # SQLAlchemy applies the configured defaults when these are None
+    # during the first flush
+    bucket.quota_size = None
+    bucket.max_file_size = None
+    db.session.commit()
+    return bucket
+
+
+def _delta_name(name, since):
+    """Return the name of the delta archive for the given snapshot name."""
+    stem, _, suffix = name.partition(".")
+    return f"{stem}-delta-{since.strftime('%Y%m%dT%H%M%SZ')}.{suffix}"
+
+
+def _get_delta_since(manifest, formats):
+    """Return the timestamp a delta export should start from, if possible.
+
+    Returns ``None`` when a full export is needed instead, i.e. when an archive
+    has no snapshot yet or too many deltas were published on top of it.
+    """
+    names = (*formats, "deleted")
+    max_deltas = current_app.config["EXPORTER_MAX_DELTAS"]
+    if any(count_deltas(manifest, name) >= max_deltas for name in names):
+        return None
+
+    marks = [high_water_mark(manifest, name) for name in names]
+    if None in marks:
+        return None
+    # Records indexed after the previous export started may be older than its
+    # high-water mark, so deltas overlap with the previous export.
+    return min(marks) - current_app.config["EXPORTER_DELTA_OVERLAP"]
+
+
+def _remove_versions(bucket, key):
+    """Remove all versions of a key."""
+    for version in ObjectVersion.get_versions(bucket=bucket, key=key):
+        current_app.logger.info(f"Removing object version: {version}")
+        version.remove()
+
+
+def _remove_stale_parts(bucket, prefix, formats, keys):
+    """Delete archive parts that were not written by the current run.
+
+    This happens when the number of shards shrinks, or multi-part archives are
+    turned off.
+    """
+    for format in formats:
+        parts = ObjectVersion.get_by_bucket(bucket).filter(
+            ObjectVersion.key.startswith(f"{prefix}records-{format}.part-")
+        )
+        for version in parts.all():
+            if version.key not in keys:
+                current_app.logger.info(f"Removing stale archive part: {version}")
+                ObjectVersion.delete(bucket, version.key)
+    db.session.commit()
+
+
+def _update_manifest(bucket, prefix, manifest, published, since, until):
+    """Record the published object versions in the manifest."""
+    until = until.isoformat()
+    for name, versions in published.items():
+        files = [
+            {"key": version.key, "version_id": str(version.version_id)}
+            for version in versions
+        ]
+        entry = manifest["archives"].get(name)
+        if since is None:
+            # A new snapshot makes the deltas of the previous one obsolete
+            for delta in entry["deltas"] if entry else []:
+                for file in delta["files"]:
+                    _remove_versions(bucket, file["key"])
+            manifest["archives"][name] = {
+                "snapshot": {"until": until, "files": files},
+                "deltas": [],
+            }
+        else:
+            entry["deltas"].append(
+                {"since": since.isoformat(), "until": until, "files": files}
+            )
+    save_manifest(bucket, prefix, manifest)
+    db.session.commit()
+
+
+def export_records(formats, community_slug, shards=None, delta=False):
+    """Export records to the configured bucket.
+
+    With more than one shard, the records are read through sliced scrolls that
+    are serialized in parallel worker processes. Otherwise, with
+    ``EXPORTER_STREAMING`` enabled, the archives are written straight into the
+    bucket's storage, and only staged locally if streaming fails (e.g. during a
+    storage outage).
+
+    With ``delta=True``, only the records changed or deleted since the previous
+    export are written, to ``records-<format>-delta-<since>.tar.gz`` archives.
+    A full export is made instead when there is no snapshot to build on, or
+    ``EXPORTER_MAX_DELTAS`` deltas were already published on top of it.
+    """
     # Validate the request
     formats = tuple(formats)
     if not formats:
@@ -27,6 +154,8 @@ def export_records(formats, community_slug):
     unsupported = set(formats) - set(EXPORT_FORMATS)
     if unsupported:
         raise ValueError(f"Unsupported formats: {', '.join(sorted(unsupported))}")
+    if "parquet" in formats:
+        parquet.require_pyarrow()
 
     # Prepare the staging directory
     configured_path = current_app.config["EXPORTER_STAGING_PATH"]
@@ -35,56 +164,103 @@ def export_records(formats, community_slug):
     )
     staging_path.mkdir(parents=True, exist_ok=True)
 
+    prefix = f"{community_slug}/" if community_slug else ""
+    bucket = Bucket.get(current_app.config["EXPORTER_BUCKET_UUID"])
+    manifest = load_manifest(bucket, prefix) if bucket else {"archives": {}}
+    # Do not keep the transaction open while the archives are written
+    db.session.commit()
+
+    since = _get_delta_since(manifest, formats) if delta else None
+    if delta and since is None:
+        current_app.logger.info("No snapshot to build a delta on, exporting all")
+    until = datetime.now(timezone.utc)
+
+    shards = shards or current_app.config["EXPORTER_SHARDS"]
+    # Sharded exports are merged from fragments, which need to be staged
+    streaming = current_app.config["EXPORTER_STREAMING"] and shards == 1
     with TemporaryDirectory(dir=staging_path) as run_path:
-        # Read records once and write every requested format
-        record_stream = read_records(community_slug)
-        paths = write_archives(Path(run_path), formats, record_stream)
-
-        prefix = f"{community_slug}/" if community_slug else ""
-        files = [(path, f"{prefix}{path.name}") for path in paths]
-
-        # Prepare the final bucket after the files are complete
-        bucket_id = current_app.config["EXPORTER_BUCKET_UUID"]
-        bucket = Bucket.get(bucket_id)
-        if bucket:
-            current_app.logger.info(f"Exporter bucket found: {bucket_id}")
-        else:
-            current_app.logger.info(f"Creating exporter bucket: {bucket_id}")
-            bucket = Bucket(
-                id=bucket_id,
-                default_location=Location.get_default().id,
-                default_storage_class=current_app.config[
-                    "FILES_REST_DEFAULT_STORAGE_CLASS"
-                ],
+        outputs = None
+        if streaming:
+            # The bucket's storage is written to while the records are read
+            bucket = _get_or_create_bucket()
+            try:
+                record_stream = read_records(community_slug, since=since)
+                outputs = list(stream_archives(bucket, formats, record_stream).items())
+            except Exception:
+                current_app.logger.exception(
+                    "Streaming export failed, falling back to staging"
+                )
+
+        if outputs is None:
+            if shards > 1:
+                paths = write_sharded_archives(
+                    Path(run_path),
+                    formats,
+                    community_slug,
+                    shards,
+                    workers=current_app.config["EXPORTER_WORKERS"],
+                    # Deltas are small enough to be published as one archive
+                    multipart=current_app.config["EXPORTER_MULTIPART"] and not since,
+                    since=since,
+                )
+            else:
+                # Read records once and write every requested format
+                record_stream = read_records(community_slug, since=since)
+                paths = write_archives(Path(run_path), formats, record_stream)
+            outputs = [(path.name, path) for path in paths]
+
+            # Prepare the final bucket after the files are complete
+            bucket = _get_or_create_bucket()
+
+        files = [
+            (
+                filename,
+                source,
+                f"{prefix}{_delta_name(filename, since) if since else filename}",
             )
-            db.session.add(bucket)
-            db.session.commit()
-            # SQLAlchemy applies the configured defaults when these are None
-            # during the first flush
-            bucket.quota_size = None
-            bucket.max_file_size = None
-            db.session.commit()
+            for filename, source in outputs
+        ]
 
         # Store each file as a new object version
-        for path, key in files:
+        published = {}
+        for filename, source, key in files:
             try:
                 version = ObjectVersion.create(
                     bucket=bucket,
                     key=key,
-                    mimetype=EXPORT_MIMETYPE,
+                    mimetype=(
+                        PARQUET_MIMETYPE
+                        if filename.endswith(".parquet")
+                        else EXPORT_MIMETYPE
+                    ),
                 )
                 current_app.logger.info(f"Creating object version: {version}")
-                with path.open("rb") as stream:
-                    version.set_contents(stream, size=path.stat().st_size)
+                if isinstance(source, Path):
+                    with source.open("rb") as stream:
+                        version.set_contents(stream, size=source.stat().st_size)
+                else:
+                    # Streamed files are already in the bucket's storage
+                    version.set_file(source)
                 db.session.add(version)
+                ObjectVersionTag.create(version, UNTIL_TAG, until.isoformat())
                 db.session.commit()
+                published.setdefault(archive_name(filename), []).append(version)
             except Exception:
                 db.session.rollback()
                 raise
 
+        keys = {key for _, _, key in files}
+        try:
+            _update_manifest(bucket, prefix, manifest, published, since, until)
+            if not since:
+                _remove_stale_parts(bucket, prefix, formats, keys)
+        except Exception:
+            db.session.rollback()
+            raise
+
         # Remove versions beyond the configured retention count
         keep = current_app.config["EXPORTER_NUMBER_VERSIONS_TO_KEEP"]
-        for _, key in files:
+        for key in [*keys, f"{prefix}{MANIFEST_KEY}"]:
             try:
                 versions = ObjectVersion.get_versions(
                     bucket=bucket,
@@ -0,0 +1,277 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Block-compressed record archives, indexed for random access.
+
+Record archives are written as a sequence of independently compressed gzip
+members ("blocks"), similarly to BGZF. Concatenated gzip members are still a
+valid ``tar.gz`` archive, which can be read from the start with any tool, but
+blocks always end on a record boundary, so a single record can be read by
+decompressing only the block it is in.
+
+Every archive has an index sidecar, a gzipped CSV file with one row per record:
+the offset and size of its block in the archive, and the offset, size and
+checksum of the record content in the uncompressed block. The rows are sorted
+by record ID, and compressed in blocks as well, and a block directory sidecar
+lists the first record ID, offset and size of every index block. A record is
+then found by a binary search in the (small) directory, and by reading a single
+block of the index, instead of loading the whole index.
+"""
+
+import csv
+import gzip
+import hashlib
+import heapq
+import tarfile
+import tempfile
+from bisect import bisect_right
+from collections import namedtuple
+from io import StringIO, TextIOWrapper
+from operator import itemgetter
+
+INDEX_HEADER = (
+    "record_id",
+    "block_offset",
+    "block_size",
+    "offset",
+    "size",
+    "checksum",
+)
+
+IndexEntry = namedtuple("IndexEntry", INDEX_HEADER)
+
+DIRECTORY_HEADER = ("record_id", "offset", "size")
+
+# Number of rows per compressed block of an index
+INDEX_BLOCK_ROWS = 4096
+
+
+class ChecksumError(Exception):
+    """The content read from an archive does not match its indexed checksum."""
+
+
+def index_filename(filename):
+    """Return the name of the index sidecar of a record archive."""
+    return f"{filename.removesuffix('.tar.gz')}.index.csv.gz"
+
+
+def directory_filename(filename):
+    """Return the name of the index block directory of a record archive."""
+    return f"{filename.removesuffix('.tar.gz')}.index.blocks.csv.gz"
+
+
+def _checksum(content):
+    return f"md5:{hashlib.md5(content).hexdigest()}"
+
+
+class BlockWriter:
+    """Write tar members as independently compressed blocks, and index them.
+
+    A block is compressed once it holds at least ``block_size`` bytes of tar
+    data, so records are never split across blocks. Offsets are counted from
+    the start of the stream, which allows indexes of concatenated archives to
+    be merged by shifting them (see ``merge_indexes``).
+    """
+
+    def __init__(self, stream, index_writer, block_size):
+        """Constructor."""
+        self._stream = stream
+        self._index_writer = index_writer
+        self._block_size = block_size
+        self._block = bytearray()
+        self._entries = []
+        self._offset = 0
+
+    def write_member(self, record_id, name, content):
+        """Write the content of a record as a tar member."""
+        info = tarfile.TarInfo(name)
+        info.size = len(content)
+        self._block += info.tobuf(
+            tarfile.DEFAULT_FORMAT, tarfile.ENCODING, "surrogateescape"
+        )
+        self._entries.append(
+            (record_id, len(self._block), len(content), _checksum(content))
+        )
+        self._block += content
+        self._block += tarfile.NUL * (-len(content) % tarfile.BLOCKSIZE)
+        if len(self._block) >= self._block_size:
+            self.flush()
+
+    def write(self, data):
+        """Write data that is not indexed (e.g. the end of the tar archive)."""
+        self._block += data
+
+    def flush(self):
+        """Compress the current block and write its index entries."""
+        if not self._block:
+            return
+        data = gzip.compress(self._block, mtime=0)
+        self._stream.write(data)
+        for record_id, offset, size, checksum in self._entries:
+            self._index_writer.writerow(
+                [record_id, self._offset, len(data), offset, size, checksum]
+            )
+        self._offset += len(data)
+        self._block.clear()
+        self._entries.clear()
+
+
+def _csv_rows(rows):
+    buffer = StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _read_rows(stream):
+    """Yield the rows of a gzipped CSV file object."""
+    with TextIOWrapper(
+        gzip.GzipFile(fileobj=stream, mode="rb"), encoding="utf-8", newline=""
+    ) as rows:
+        yield from csv.reader(rows)
+
+
+class IndexWriter:
+    """Write an index sorted by record ID, with its block directory.
+
+    Rows are added in any order. They are sorted in memory in runs of at most
+    ``buffer_size`` rows, which are spilled to temporary files, and the runs are
+    merged when the writer is closed, so memory usage does not depend on the
+    number of records.
+    """
+
+    def __init__(self, stream, directory_stream, header=True, buffer_size=100_000):
+        """Constructor."""
+        self._stream = stream
+        self._directory_stream = directory_stream
+        self._header = header
+        self._buffer_size = buffer_size
+        self._rows = []
+        self._runs = []
+
+    def writerow(self, row):
+        """Add a row to the index."""
+        self._rows.append(row)
+        if len(self._rows) >= self._buffer_size:
+            self._spill()
+
+    def _spill(self):
+        """Write the sorted rows in memory to a temporary file."""
+        self._rows.sort(key=itemgetter(0))
+        run = tempfile.TemporaryFile()
+        run.write(gzip.compress(_csv_rows(self._rows), mtime=0))
+        run.seek(0)
+        self._runs.append(run)
+        self._rows.clear()
+
+    def close(self):
+        """Write the sorted index and its directory."""
+        if self._runs:
+            self._spill()
+            rows = heapq.merge(
+                *(_read_rows(run) for run in self._runs), key=itemgetter(0)
+            )
+        else:
+            rows = sorted(self._rows, key=itemgetter(0))
+        try:
+            self.write_sorted(rows)
+        finally:
+            for run in self._runs:
+                run.close()
+
+    def write_sorted(self, rows):
+        """Write index rows, already sorted by record ID, in blocks."""
+        offset = 0
+        if self._header:
+            data = gzip.compress(_csv_rows([INDEX_HEADER]), mtime=0)
+            self._stream.write(data)
+            offset += len(data)
+
+        directory = [DIRECTORY_HEADER]
+        block = []
+        for row in rows:
+            block.append(row)
+            if len(block) == INDEX_BLOCK_ROWS:
+                offset += self._write_block(block, offset, directory)
+        if block:
+            self._write_block(block, offset, directory)
+        self._directory_stream.write(gzip.compress(_csv_rows(directory), mtime=0))
+
+    def _write_block(self, block, offset, directory):
+        data = gzip.compress(_csv_rows(block), mtime=0)
+        self._stream.write(data)
+        directory.append((block[0][0], offset, len(data)))
+        block.clear()
+        return len(data)
+
+
+def _shifted_rows(path, shift):
+    with open(path, "rb") as stream:
+        for row in _read_rows(stream):
+            row[1] = int(row[1]) + shift
+            yield row
+
+
+def merge_indexes(sources, stream, directory_stream):
+    """Write one index for concatenated archives.
+
+    ``sources`` are pairs of index fragment paths and offsets of the archive
+    fragments they index, in the merged archive. Fragments are sorted, so they
+    are merged without loading them.
+    """
+    rows = heapq.merge(
+        *(_shifted_rows(path, shift) for path, shift in sources), key=itemgetter(0)
+    )
+    IndexWriter(stream, directory_stream).write_sorted(rows)
+
+
+def load_index(stream):
+    """Load a whole index sidecar, by record ID."""
+    with gzip.open(stream, mode="rt", encoding="utf-8", newline="") as rows:
+        reader = csv.reader(rows)
+        next(reader)
+        return {row[0]: _index_entry(row) for row in reader}
+
+
+def _index_entry(row):
+    record_id, block_offset, block_size, offset, size, checksum = row
+    return IndexEntry(
+        record_id, int(block_offset), int(block_size), int(offset), int(size), checksum
+    )
+
+
+def load_directory(stream):
+    """Load the block directory of an index.
+
+    Returns the first record IDs of the blocks, and their offsets and sizes.
+    """
+    rows = _read_rows(stream)
+    next(rows)
+    record_ids, blocks = [], []
+    for record_id, offset, size in rows:
+        record_ids.append(record_id)
+        blocks.append((int(offset), int(size)))
+    return record_ids, blocks
+
+
+def find_entry(stream, directory, record_id):
+    """Return the index entry of a record, reading one block of a seekable index."""
+    record_ids, blocks = directory
+    position = bisect_right(record_ids, record_id) - 1
+    if position < 0:
+        return None
+    offset, size = blocks[position]
+    stream.seek(offset)
+    block = gzip.decompress(stream.read(size)).decode("utf-8")
+    for row in csv.reader(StringIO(block)):
+        if row[0] == record_id:
+            return _index_entry(row)
+    return None
+
+
+def read_record(stream, entry):
+    """Read the content of an indexed record from a seekable archive stream."""
+    stream.seek(entry.block_offset)
+    block = gzip.decompress(stream.read(entry.block_size))
+    content = block[entry.offset : entry.offset + entry.size]
+    if _checksum(content) != entry.checksum:
+        raise ChecksumError(f"Checksum mismatch for record: {entry.record_id}")
+    return content
@@ -30,11 +30,23 @@ def exporter():
     type=str,
     help="Slug of the community.",
 )
+@click.option(
+    "-s",
+    "--shards",
+    type=click.IntRange(min=1),
+    help="Number of shards exported in parallel (default: EXPORTER_SHARDS).",
+)
+@click.option(
+    "--delta",
+    is_flag=True,
+    default=False,
+    help="Only export the records changed since the previous export.",
+)
 @with_appcontext
-def export_records_command(formats, community_slug):
+def export_records_command(formats, community_slug, shards, delta):
     """Export records."""
     try:
-        export_records(formats, community_slug)
+        export_records(formats, community_slug, shards=shards, delta=delta)
         click.secho("Records exported successfully.", fg="green")
     except Exception as e:
         raise click.ClickException(f"Error exporting records: {e}") from e
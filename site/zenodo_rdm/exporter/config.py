@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """ZenodoRDM exporter configuration."""
 
+from datetime import timedelta
 from uuid import UUID
 
 EXPORTER_BUCKET_UUID = UUID("00000000-0000-0000-0000-000000000001")
@@ -10,6 +11,9 @@ EXPORTER_NUMBER_VERSIONS_TO_KEEP = 3
 
 EXPORTER_JOB_DEFAULT_FORMATS = ("json",)
 
+# Export only the records changed since the previous job run, as delta archives.
+EXPORTER_JOB_DEFAULT_DELTA = True
+
 # TODO: Use `example-community-slug` when custom args work properly.
 EXPORTER_JOB_DEFAULT_COMMUNITY_SLUG = "biosyslit"
 
@@ -17,3 +21,56 @@ EXPORTER_JOB_DEFAULT_COMMUNITY_SLUG = "biosyslit"
 # be backed by a persistent volume so completed exports survive job restarts and
 # EOS outages.
 EXPORTER_STAGING_PATH = None
+
+# Write unsharded exports straight into the bucket's storage, instead of staging
+# them in ``EXPORTER_STAGING_PATH`` first. Exports fall back to staging when the
+# upload fails.
+EXPORTER_STREAMING = False
+
+# Size of the chunks the streamed archives are written to the storage in.
+EXPORTER_STREAMING_CHUNK_SIZE = 64 * 1024 * 1024
+
+# Size of the uncompressed blocks the record archives are compressed in. Smaller
+# blocks make single record reads faster, at the cost of a worse compression.
+EXPORTER_BLOCK_SIZE = 64 * 1024
+
+# Number of index rows sorted in memory, before they are spilled to a temporary
+# file. Record archive indexes are sorted by record ID, for record lookups.
+EXPORTER_INDEX_BUFFER_SIZE = 100_000
+
+# Number of rows per row group of the ``parquet`` export format, which bounds the
+# memory used to write it.
+EXPORTER_PARQUET_ROW_GROUP_SIZE = 100_000
+
+# How records are read from the search engine: through a ``scroll``, or through
+# ``search_after`` pages of a ``point_in_time``, which can be resumed after a
+# failure without starting the export over.
+EXPORTER_READER = "scroll"
+
+# Number of records per page, when reading through a point in time.
+EXPORTER_READER_PAGE_SIZE = 1000
+
+# Time a point in time is kept alive between two pages.
+EXPORTER_READER_KEEP_ALIVE = "15m"
+
+# Number of consecutive failed pages after which the export fails.
+EXPORTER_READER_RETRIES = 3
+
+# Number of sliced scrolls the records are read from. With more than one shard,
+# slices are serialized in parallel worker processes and merged afterwards.
+EXPORTER_SHARDS = 1
+
+# Number of worker processes for sharded exports. Defaults to one per shard.
+EXPORTER_WORKERS = None
+
+# Publish sharded exports as ``records-<format>.part-<n>.tar.gz`` archives,
+# instead of concatenating the shards into one archive per format.
+EXPORTER_MULTIPART = False
+
+# Number of delta archives published on top of a snapshot before the next delta
+# export is turned into a full one.
+EXPORTER_MAX_DELTAS = 7
+
+# Deltas start this long before the previous export, to include records that
+# were indexed while it was running.
+EXPORTER_DELTA_OVERLAP = timedelta(hours=1)
@@ -0,0 +1,255 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""DataCite schema with memoized vocabulary lookups, for exports."""
+
+from invenio_access.permissions import system_identity
+from invenio_base import invenio_url_for
+from invenio_rdm_records.proxies import current_rdm_records_service
+from invenio_rdm_records.resources.serializers.datacite.schema import (
+    RELATED_IDENTIFIER_SCHEMES,
+    ContributorSchema4,
+    DataCite45Schema,
+    get_scheme_datacite,
+)
+from invenio_rdm_records.resources.serializers.utils import get_vocabulary_props
+from marshmallow import fields, missing
+from marshmallow_utils.html import strip_html
+from pydash import py_
+
+
+class VocabularyProps:
+    """Memoized props of vocabulary items."""
+
+    def __init__(self):
+        """Constructor."""
+        self._props = {}
+
+    def get(self, vocabulary, fields, id_):
+        """Return a copy of the props of a vocabulary item."""
+        # The fields are passed as a list, which is not hashable
+        key = (vocabulary, tuple(fields), id_)
+        if key not in self._props:
+            self._props[key] = get_vocabulary_props(vocabulary, fields, id_)
+        return dict(self._props[key])
+
+
+class ContributorSchema(ContributorSchema4):
+    """Contributor schema, with memoized role lookups."""
+
+    def __init__(self, vocabulary_props, **kwargs):
+        """Constructor."""
+        super().__init__(**kwargs)
+        self.vocabulary_props = vocabulary_props
+
+    def get_role(self, obj):
+        """Get datacite role."""
+        role = obj.get("role")
+        if not role:
+            return missing
+
+        props = self.vocabulary_props.get(
+            "contributorsroles", ["props.datacite"], role["id"]
+        )
+        return props.get("datacite", "")
+
+
+class MemoizedDataCite45Schema(DataCite45Schema):
+    """DataCite JSON 4.5 schema, with memoized vocabulary lookups.
+
+    The resource, title, description, date and relation types, and the roles of
+    contributors are looked up once per schema instance. Apart from the lookups,
+    the overridden methods are the same as in ``DataCite45Schema``.
+    """
+
+    contributors = fields.Method("get_contributors")
+
+    def __init__(self, **kwargs):
+        """Constructor."""
+        super().__init__(**kwargs)
+        self.vocabulary_props = VocabularyProps()
+        self._contributor_schema = ContributorSchema(self.vocabulary_props)
+
+    def get_contributors(self, obj):
+        """Get contributors list."""
+        contributors = py_.get(obj, "metadata.contributors")
+        if contributors is None:
+            return missing
+        return self._contributor_schema.dump(contributors, many=True)
+
+    def get_type(self, obj):
+        """Get resource type."""
+        resource_type_id = py_.get(obj, "metadata.resource_type.id")
+        if not resource_type_id:
+            return missing
+
+        props = self.vocabulary_props.get(
+            "resourcetypes",
+            ["props.datacite_general", "props.datacite_type"],
+            resource_type_id,
+        )
+        return {
+            "resourceTypeGeneral": props.get("datacite_general", "Other"),
+            "resourceType": props.get("datacite_type", ""),
+        }
+
+    def _merge_main_and_additional(self, obj, field, default_type=None):
+        """Return merged list of main + additional titles/descriptions."""
+        result = []
+        main_value = obj["metadata"].get(field)
+
+        if main_value:
+            item = {field: strip_html(main_value)}
+            if default_type:
+                item[f"{field}Type"] = default_type
+            result.append(item)
+
+        additional_values = obj["metadata"].get(f"additional_{field}s", [])
+        for v in additional_values:
+            item = {field: strip_html(v.get(field))}
+
+            # Type
+            type_id = v.get("type", {}).get("id")
+            if type_id:
+                props = self.vocabulary_props.get(
+                    f"{field}types", ["props.datacite"], type_id
+                )
+                if "datacite" in props:
+                    item[f"{field}Type"] = props["datacite"]
+
+            # Language
+            lang_id = v.get("lang", {}).get("id")
+            if lang_id:
+                item["lang"] = lang_id
+
+            result.append(item)
+
+        return result or missing
+
+    def get_dates(self, obj):
+        """Get dates."""
+        pub_date = py_.get(obj, "metadata.publication_date")
+        dates = [{"date": pub_date, "dateType": "Issued"}] if pub_date else []
+
+        updated = False
+
+        for date in obj["metadata"].get("dates", []):
+            date_type_id = date.get("type", {}).get("id")
+            if date_type_id == "updated":
+                updated = True
+            props = self.vocabulary_props.get(
+                "datetypes", ["props.datacite"], date_type_id
+            )
+            to_append = {
+                "date": date["date"],
+                "dateType": props.get("datacite", "Other"),
+            }
+            desc = date.get("description")
+            if desc:
+                to_append["dateInformation"] = desc
+
+            dates.append(to_append)
+
+        if not updated:
+            try:
+                updated_date = obj["updated"]
+            except KeyError:
+                # If no update date is present, do nothing
+                pass
+            else:
+                to_append = {
+                    "date": updated_date.split("T")[0],
+                    "dateType": "Updated",
+                }
+                dates.append(to_append)
+
+        return dates or missing
+
+    def get_related_identifiers(self, obj):
+        """Get related identifiers."""
+        serialized_identifiers = []
+        metadata = obj["metadata"]
+        identifiers = metadata.get("related_identifiers", [])
+        for rel_id in identifiers:
+            relation_type_id = rel_id.get("relation_type", {}).get("id")
+            props = self.vocabulary_props.get(
+                "relationtypes", ["props.datacite"], relation_type_id
+            )
+
+            scheme = rel_id["scheme"]
+            id_scheme = get_scheme_datacite(
+                scheme, "RDM_RECORDS_RELATED_IDENTIFIERS_SCHEMES", default=scheme
+            )
+
+            # Only serialize related identifiers with a valid scheme for DataCite.
+            if id_scheme and id_scheme.lower() in RELATED_IDENTIFIER_SCHEMES:
+                serialized_identifier = {
+                    "relatedIdentifier": rel_id["identifier"],
+                    "relationType": props.get("datacite", ""),
+                    "relatedIdentifierType": id_scheme,
+                }
+
+                resource_type_id = rel_id.get("resource_type", {}).get("id")
+                if resource_type_id:
+                    props = self.vocabulary_props.get(
+                        "resourcetypes",
+                        # Same fields as the record resource type, to share the memo
+                        ["props.datacite_general", "props.datacite_type"],
+                        resource_type_id,
+                    )
+                    serialized_identifier["resourceTypeGeneral"] = props.get(
+                        "datacite_general", "Other"
+                    )
+
+                serialized_identifiers.append(serialized_identifier)
+
+        # Generate parent/child versioning relationships
+        if self.is_parent:
+            # Fetch DOIs for all versions
+            current_rdm_records_service.indexer.refresh()
+            record_versions = current_rdm_records_service.scan_versions(
+                system_identity,
+                obj._child["id"],
+                params={"_source_includes": "pids.doi"},
+            )
+            for version in record_versions:
+                version_doi = version.get("pids", {}).get("doi")
+
+                if version_doi:
+                    serialized_identifiers.append(
+                        {
+                            "relatedIdentifier": version_doi["identifier"],
+                            "relationType": "HasVersion",
+                            "relatedIdentifierType": "DOI",
+                        }
+                    )
+        else:
+            if hasattr(obj, "parent"):
+                parent_record = obj.parent
+            else:
+                parent_record = obj.get("parent", {})
+            parent_doi = parent_record.get("pids", {}).get("doi")
+
+            if parent_doi:
+                serialized_identifiers.append(
+                    {
+                        "relatedIdentifier": parent_doi["identifier"],
+                        "relationType": "IsVersionOf",
+                        "relatedIdentifierType": "DOI",
+                    }
+                )
+
+        # adding communities
+        communities = obj.get("parent", {}).get("communities", {}).get("entries", [])
+        for community in communities:
+            slug = community.get("slug")
+            url = invenio_url_for(
+                "invenio_app_rdm_communities.communities_home", pid_value=slug
+            )
+            serialized_identifiers.append(
+                {
+                    "relatedIdentifier": url,
+                    "relationType": "IsPartOf",
+                    "relatedIdentifierType": "URL",
+                }
+            )
+        return serialized_identifiers or missing
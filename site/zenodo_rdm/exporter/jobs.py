@@ -24,4 +24,8 @@ class ExportRecords(JobType):
         default_community_slug = current_app.config[
             "EXPORTER_JOB_DEFAULT_COMMUNITY_SLUG"
         ]
-        return {"formats": default_formats, "community_slug": default_community_slug}
+        return {
+            "formats": default_formats,
+            "community_slug": default_community_slug,
+            "delta": current_app.config["EXPORTER_JOB_DEFAULT_DELTA"],
+        }
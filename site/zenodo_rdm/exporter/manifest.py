@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Manifest of the published export archives.
+
+The manifest lists, for every archive (i.e. each record format and the deleted
+records), the base snapshot and the delta archives published on top of it::
+
+    {
+        "archives": {
+            "json": {
+                "snapshot": {"until": ..., "files": [...]},
+                "deltas": [
+                    {"since": ..., "until": ..., "files": [...]},
+                ],
+            },
+        },
+    }
+
+Each file is listed with its ``key`` and ``version_id``; snapshots of sharded
+exports have one file per part. Applying the deltas in order on top of the
+snapshot gives the records as they were at the ``until`` timestamp of the last
+delta.
+"""
+
+import json
+from io import BytesIO
+
+import arrow
+from invenio_files_rest.models import ObjectVersion
+
+MANIFEST_KEY = "manifest.json"
+MANIFEST_MIMETYPE = "application/json"
+
+
+def load_manifest(bucket, prefix):
+    """Load the manifest of the exports under the given key prefix."""
+    version = ObjectVersion.get(bucket, f"{prefix}{MANIFEST_KEY}")
+    if not version:
+        return {"archives": {}}
+    with version.file.storage().open() as stream:
+        return json.load(stream)
+
+
+def save_manifest(bucket, prefix, manifest):
+    """Store the manifest as a new object version."""
+    content = json.dumps(manifest, indent=2).encode()
+    version = ObjectVersion.create(
+        bucket=bucket,
+        key=f"{prefix}{MANIFEST_KEY}",
+        mimetype=MANIFEST_MIMETYPE,
+    )
+    version.set_contents(BytesIO(content), size=len(content))
+    return version
+
+
+def high_water_mark(manifest, name):
+    """Return the ``until`` timestamp of the latest archive published for a name."""
+    entry = manifest["archives"].get(name)
+    if not entry:
+        return None
+    latest = entry["deltas"][-1] if entry["deltas"] else entry["snapshot"]
+    return arrow.get(latest["until"]).datetime
+
+
+def count_deltas(manifest, name):
+    """Return the number of deltas published on top of the snapshot of a name."""
+    entry = manifest["archives"].get(name)
+    return len(entry["deltas"]) if entry else 0
@@ -0,0 +1,200 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Write records as a Parquet table, for analytics.
+
+The main metadata fields of the records are flattened into typed columns, so
+that the table can be queried directly (e.g. with DuckDB), without parsing the
+JSON records. The ``parquet`` export format requires ``pyarrow``.
+"""
+
+from datetime import date, datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # pyarrow is a dependency, but is checked when the format is requested, to
+    # fail with a clear error on installations without it
+    pa = pq = None
+
+COMPRESSION = "zstd"
+
+
+class PyArrowMissingError(RuntimeError):
+    """The ``parquet`` export format was requested, but pyarrow is missing."""
+
+
+def require_pyarrow():
+    """Raise an error if pyarrow is not installed."""
+    if pa is None:
+        raise PyArrowMissingError(
+            "The parquet export format requires pyarrow, which is not installed."
+        )
+
+
+def record_schema():
+    """Return the schema of the records table."""
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("parent_id", pa.string()),
+            ("doi", pa.string()),
+            ("parent_doi", pa.string()),
+            ("version", pa.string()),
+            ("resource_type", pa.string()),
+            ("title", pa.string()),
+            # EDTF dates can be partial dates or intervals
+            ("publication_date", pa.string()),
+            ("created", pa.timestamp("us", tz="UTC")),
+            ("updated", pa.timestamp("us", tz="UTC")),
+            ("creators", pa.list_(pa.string())),
+            ("creator_orcids", pa.list_(pa.string())),
+            ("funders", pa.list_(pa.string())),
+            ("awards", pa.list_(pa.string())),
+            ("communities", pa.list_(pa.string())),
+            ("file_count", pa.int64()),
+            ("file_size", pa.int64()),
+            ("access_record", pa.string()),
+            ("access_files", pa.string()),
+            ("embargo_until", pa.date32()),
+        ]
+    )
+
+
+def _timestamp(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+def _date(value):
+    return date.fromisoformat(value) if value else None
+
+
+def _doi(pids):
+    return pids.get("doi", {}).get("identifier")
+
+
+def flatten_record(record):
+    """Return the row of a record in the records table."""
+    metadata = record.get("metadata", {})
+    parent = record.get("parent", {})
+    access = record.get("access", {})
+    files = record.get("files", {})
+    creators = [
+        creator.get("person_or_org", {}) for creator in metadata.get("creators", [])
+    ]
+    funding = metadata.get("funding", [])
+
+    return {
+        "id": record["id"],
+        "parent_id": parent.get("id"),
+        "doi": _doi(record.get("pids", {})),
+        "parent_doi": _doi(parent.get("pids", {})),
+        "version": metadata.get("version"),
+        "resource_type": metadata.get("resource_type", {}).get("id"),
+        "title": metadata.get("title"),
+        "publication_date": metadata.get("publication_date"),
+        "created": _timestamp(record.get("created")),
+        "updated": _timestamp(record.get("updated")),
+        "creators": [creator.get("name") for creator in creators],
+        "creator_orcids": [
+            identifier["identifier"]
+            for creator in creators
+            for identifier in creator.get("identifiers", [])
+            if identifier.get("scheme") == "orcid"
+        ],
+        "funders": [
+            item["funder"].get("id") or item["funder"].get("name")
+            for item in funding
+            if item.get("funder")
+        ],
+        "awards": [
+            item["award"].get("id") or item["award"].get("number")
+            for item in funding
+            if item.get("award")
+        ],
+        "communities": parent.get("communities", {}).get("ids", []),
+        "file_count": files.get("count"),
+        "file_size": files.get("total_bytes"),
+        "access_record": access.get("record"),
+        "access_files": access.get("files"),
+        "embargo_until": _date(access.get("embargo", {}).get("until")),
+    }
+
+
+class _PositionStream:
+    """Count the bytes written to a stream that cannot tell its position.
+
+    The Parquet writer needs the position of the written data, which pipes to
+    a storage backend do not provide.
+    """
+
+    closed = False
+
+    def __init__(self, stream):
+        """Constructor."""
+        self._stream = stream
+        self._position = 0
+
+    def write(self, data):
+        """Write to the stream."""
+        self._stream.write(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        """Return the number of written bytes."""
+        return self._position
+
+    def flush(self):
+        """Flush the stream."""
+        self._stream.flush()
+
+    def close(self):
+        """Stop writing, and leave the stream open."""
+        self.closed = True
+
+
+class ParquetArchive:
+    """Write records to a Parquet file, in row groups of bounded size.
+
+    Rows are buffered until a full row group can be written, so memory usage is
+    bounded by the row group size rather than the number of exported records.
+    """
+
+    def __init__(self, stream, row_group_size):
+        """Constructor."""
+        require_pyarrow()
+        self._row_group_size = row_group_size
+        self._schema = record_schema()
+        self._writer = pq.ParquetWriter(
+            _PositionStream(stream), self._schema, compression=COMPRESSION
+        )
+        self._rows = []
+
+    def write_batch(self, records):
+        """Add records to the table."""
+        self._rows.extend(flatten_record(record) for record in records)
+        if len(self._rows) >= self._row_group_size:
+            self._write_row_group()
+
+    def _write_row_group(self):
+        if self._rows:
+            table = pa.Table.from_pylist(self._rows, schema=self._schema)
+            self._writer.write_table(table, row_group_size=len(self._rows))
+            self._rows.clear()
+
+    def close(self):
+        """Write the remaining rows and the file footer."""
+        self._write_row_group()
+        self._writer.close()
+
+
+def merge_tables(paths, stream):
+    """Merge Parquet files with the records schema, one row group at a time."""
+    with pq.ParquetWriter(
+        _PositionStream(stream), record_schema(), compression=COMPRESSION
+    ) as writer:
+        for path in paths:
+            source = pq.ParquetFile(path)
+            for index in range(source.num_row_groups):
+                writer.write_table(source.read_row_group(index))
@@ -2,16 +2,93 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Read records for export."""
 
+import time
+
 from flask import current_app
 from flask_principal import AnonymousIdentity, identity_changed
 from invenio_access.permissions import any_user
 from invenio_communities.communities.records.models import CommunityMetadata
 from invenio_db import db
 from invenio_rdm_records.proxies import current_rdm_records_service
+from invenio_search.engine import dsl
+from invenio_search.engine import search as search_engine
+from invenio_search.proxies import current_search_client
+
+
+def _delete_pit(client, pit_id):
+    """Release a point in time, which otherwise lives until it expires."""
+    try:
+        client.delete_pit(body={"pit_id": [pit_id]})
+    except search_engine.exceptions.TransportError:
+        current_app.logger.warning(f"Could not delete point in time: {pit_id}")
+
+
+def _search_after(query, page_size, keep_alive, retries):
+    """Return all hits of a search, paginated with a point in time.
+
+    Pages are sorted by record ID and requested with ``search_after``. When a
+    request fails (e.g. the point in time expired), a new point in time is
+    opened and the search resumes after the last returned hit, instead of
+    starting over. The position is only kept for the lifetime of the generator,
+    so an export task that fails is still started over by its next run.
+    """
+    client = current_search_client
+    index = query._index
+    # Searches on a point in time must not target an index
+    query = query.index().sort("id")[:page_size]
+
+    pit_id = None
+    search_after = None
+    failures = 0
+    try:
+        while True:
+            try:
+                if pit_id is None:
+                    pit_id = client.create_pit(index=index, keep_alive=keep_alive)[
+                        "pit_id"
+                    ]
+                page = query.extra(pit={"id": pit_id, "keep_alive": keep_alive})
+                if search_after:
+                    page = page.extra(search_after=search_after)
+                response = page.execute()
+            except search_engine.exceptions.TransportError:
+                failures += 1
+                if failures > retries:
+                    raise
+                current_app.logger.warning(
+                    f"Search failed, resuming after {search_after} "
+                    f"(attempt {failures}/{retries})",
+                    exc_info=True,
+                )
+                if pit_id:
+                    _delete_pit(client, pit_id)
+                    pit_id = None
+                time.sleep(2**failures)
+                continue
 
+            failures = 0
+            if not response.hits:
+                return
+            yield from response.hits
+            search_after = list(response.hits[-1].meta.sort)
+            # The ID of a point in time can change between requests
+            pit_id = getattr(response, "pit_id", pit_id)
+    finally:
+        if pit_id:
+            _delete_pit(client, pit_id)
 
-def read_records(community_slug):
-    """Return a lazy stream of records to export."""
+
+def read_records(community_slug, slice_id=None, max_slices=None, since=None):
+    """Return a lazy stream of records to export.
+
+    When ``max_slices`` is given, only the records of the slice ``slice_id`` are
+    returned, so that slices can be read in parallel. When ``since`` is given,
+    only the records updated (or deleted) since then are returned.
+
+    The records are read through a scroll, or with ``EXPORTER_READER`` set to
+    ``point_in_time``, through ``search_after`` pages of a point in time, which
+    do not expire during long exports and can be resumed after a failure.
+    """
     community_id = None
     if community_slug:
         community_id = (
@@ -29,17 +106,27 @@ def read_records(community_slug):
     records = current_rdm_records_service
     params = {"allversions": True, "include_deleted": True}
     records.require_permission(identity, "search")
-    result = (
-        records._search(
-            "scan",
-            identity,
-            params,
-            None,
-            q=f"parent.communities.ids:{community_id}" if community_id else "",
-        )
-        .params(scroll="15m")
-        .scan()
+    search = records._search(
+        "scan",
+        identity,
+        params,
+        None,
+        q=f"parent.communities.ids:{community_id}" if community_id else "",
+        extra_filter=(
+            dsl.Q("range", updated={"gte": since.isoformat()}) if since else None
+        ),
     )
+    if max_slices and max_slices > 1:
+        search = search.extra(slice={"id": slice_id, "max": max_slices})
+    if current_app.config["EXPORTER_READER"] == "point_in_time":
+        result = _search_after(
+            search,
+            current_app.config["EXPORTER_READER_PAGE_SIZE"],
+            current_app.config["EXPORTER_READER_KEEP_ALIVE"],
+            current_app.config["EXPORTER_READER_RETRIES"],
+        )
+    else:
+        result = search.params(scroll="15m").scan()
     return records.result_list(
         records,
         identity,
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Serialize batches of exported records."""
+
+import json
+
+from datacite import schema45
+from flask import current_app
+from invenio_rdm_records.contrib.journal.processors import JournalDataciteDumper
+from lxml import etree
+
+from .datacite import MemoizedDataCite45Schema
+
+OAI_DATACITE_NSMAP = {
+    None: "http://schema.datacite.org/oai/oai-1.1/",
+    "xsi": "http://www.w3.org/2001/XMLSchema-instance",
+}
+OAI_DATACITE_SCHEMA_LOCATION = (
+    "http://schema.datacite.org/oai/oai-1.1/ "
+    "http://schema.datacite.org/oai/oai-1.1/oai.xsd"
+)
+
+
+class JSONBatchSerializer:
+    """Serialize batches of records to JSON."""
+
+    mimetype = "application/json"
+
+    def serialize_batch(self, records):
+        """Return the serialized content of each record."""
+        return [json.dumps(record).encode() for record in records]
+
+
+class OAIDataCiteBatchSerializer:
+    """Serialize batches of records to OAI DataCite XML.
+
+    The documents are the same as the ones built by ``oai_datacite_etree``, but
+    one schema instance is reused for all records, and the vocabulary lookups of
+    the schema (resource, title, description, date and relation types, and
+    roles) are memoized by the schema for the lifetime of the serializer.
+    """
+
+    mimetype = "application/xml"
+
+    def __init__(self):
+        """Constructor."""
+        self._schema = MemoizedDataCite45Schema(dumpers=[JournalDataciteDumper()])
+        self._datacentre_symbol = current_app.config.get("DATACITE_DATACENTER_SYMBOL")
+
+    def _etree(self, record):
+        """Return the ``oai_datacite`` element of a record."""
+        resource_dict = self._schema.dump(record)
+
+        oai_datacite = etree.Element(
+            "oai_datacite",
+            nsmap=OAI_DATACITE_NSMAP,
+            attrib={
+                f"{{{OAI_DATACITE_NSMAP['xsi']}}}schemaLocation": (
+                    OAI_DATACITE_SCHEMA_LOCATION
+                ),
+            },
+        )
+        etree.SubElement(oai_datacite, "schemaVersion").text = "4.5"
+        etree.SubElement(oai_datacite, "datacentreSymbol").text = (
+            self._datacentre_symbol
+        )
+        payload = etree.SubElement(oai_datacite, "payload")
+        payload.append(schema45.dump_etree(resource_dict))
+        return oai_datacite
+
+    def serialize_batch(self, records):
+        """Return the serialized content of each record."""
+        contents = []
+        for record in records:
+            try:
+                tree = self._etree(record)
+            except Exception:
+                current_app.logger.exception(
+                    f"Could not serialize record: {record.get('id')}"
+                )
+                raise
+            contents.append(
+                etree.tostring(tree, xml_declaration=True, encoding="UTF-8")
+            )
+        return contents
+
+
+SERIALIZERS = {
+    "json": JSONBatchSerializer,
+    "xml": OAIDataCiteBatchSerializer,
+}
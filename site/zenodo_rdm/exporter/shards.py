@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Export records in parallel shards."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from flask import current_app
+from invenio_db import db
+
+from zenodo_rdm.exporter.readers import read_records
+from zenodo_rdm.exporter.writers import merge_archives, write_archives
+
+
+def _init_worker(app):
+    """Prepare a forked worker process for exporting shards."""
+    app.app_context().push()
+    # Connections inherited from the parent process must not be shared with it
+    db.engine.dispose(close=False)
+    app.extensions["invenio-search"]._client = None
+
+
+def _write_shard(run_path, formats, community_slug, since, shard, shards):
+    """Write the archive fragments of one sliced scroll."""
+    shard_path = run_path / f"shard-{shard:04d}"
+    shard_path.mkdir()
+    current_app.logger.info(f"Exporting shard {shard + 1}/{shards}")
+    records = read_records(
+        community_slug, slice_id=shard, max_slices=shards, since=since
+    )
+    return write_archives(shard_path, formats, records, complete=False)
+
+
+def write_sharded_archives(
+    run_path: Path,
+    formats,
+    community_slug,
+    shards: int,
+    workers: int = None,
+    multipart: bool = False,
+    since=None,
+) -> list[Path]:
+    """Write all requested formats from sliced scrolls read in parallel.
+
+    Every slice is read and serialized in its own worker process, and the
+    resulting fragments are merged once all of them are complete.
+    """
+    args = (run_path, formats, community_slug, since)
+    if multiprocessing.current_process().daemon:
+        # Daemonic processes (e.g. Celery prefork workers) cannot have children
+        current_app.logger.warning(
+            "Export started from a daemonic process, writing shards sequentially."
+        )
+        fragments = [_write_shard(*args, shard, shards) for shard in range(shards)]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers or shards,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(current_app._get_current_object(),),
+        ) as executor:
+            futures = [
+                executor.submit(_write_shard, *args, shard, shards)
+                for shard in range(shards)
+            ]
+            fragments = [future.result() for future in futures]
+
+    return merge_archives(run_path, formats, fragments, multipart=multipart)
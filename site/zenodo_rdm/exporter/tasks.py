@@ -8,6 +8,6 @@ from zenodo_rdm.exporter import api
 
 
 @shared_task
-def export_records(formats, community_slug):
+def export_records(formats, community_slug, shards=None, delta=False):
     """Export records."""
-    return api.export_records(formats, community_slug)
+    return api.export_records(formats, community_slug, shards=shards, delta=delta)
@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Stream export archives to the storage backend."""
+
+import os
+from threading import Thread
+
+from flask import current_app
+from invenio_db import db
+from invenio_files_rest.models import FileInstance
+
+from zenodo_rdm.exporter.writers import archive_filenames, write_streams
+
+
+class StreamingUpload:
+    """Upload the bytes written to a pipe into a new file instance.
+
+    The storage backend reads the pipe in a background thread while the archive
+    is written, and computes the checksum on the fly, so the archive is never
+    staged on a local disk.
+    """
+
+    def __init__(self, bucket, chunk_size=None):
+        """Create the file instance and start the upload."""
+        self.file = FileInstance.create()
+        self._storage = self.file.storage(
+            default_location=bucket.location.uri,
+            default_storage_class=bucket.default_storage_class,
+        )
+        self._chunk_size = chunk_size
+        self._result = None
+        self._error = None
+
+        read_fd, write_fd = os.pipe()
+        self._pipe = os.fdopen(read_fd, "rb")
+        self.stream = os.fdopen(write_fd, "wb")
+        self._thread = Thread(
+            target=self._upload,
+            args=(current_app._get_current_object(),),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _upload(self, app):
+        """Save the content of the pipe in the storage backend."""
+        # Closing the pipe when the upload fails makes the writer fail as well,
+        # instead of blocking on a full pipe.
+        with app.app_context(), self._pipe:
+            try:
+                self._result = self._storage.save(
+                    self._pipe, chunk_size=self._chunk_size
+                )
+            except Exception as e:
+                self._error = e
+
+    def finish(self):
+        """Wait for the upload to complete and return the file instance."""
+        self.stream.close()
+        self._thread.join()
+        if self._error:
+            raise self._error
+        self.file.set_uri(*self._result)
+        return self.file
+
+    def abort(self):
+        """Stop the upload and delete the partially uploaded data."""
+        try:
+            self.stream.close()
+        except OSError:
+            # The upload failed and closed the reading end of the pipe
+            pass
+        self._thread.join()
+        try:
+            self._storage.delete()
+        except Exception:
+            current_app.logger.warning(f"Could not delete partial upload: {self.file}")
+        db.session.delete(self.file)
+
+
+def stream_archives(bucket, formats, records):
+    """Write all requested formats straight into the storage of a bucket.
+
+    Returns the uploaded file instances by file name, in the order of
+    ``archive_filenames``.
+    """
+    chunk_size = current_app.config["EXPORTER_STREAMING_CHUNK_SIZE"]
+    filenames = archive_filenames(formats)
+    uploads = [StreamingUpload(bucket, chunk_size=chunk_size) for _ in filenames]
+    # The file instances are only readable once the uploads complete
+    db.session.commit()
+
+    try:
+        write_streams([upload.stream for upload in uploads], formats, records)
+        files = {
+            filename: upload.finish() for filename, upload in zip(filenames, uploads)
+        }
+    except Exception:
+        for upload in uploads:
+            upload.abort()
+        db.session.commit()
+        raise
+
+    return files
@@ -2,9 +2,22 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """ZenodoRDM exporter views."""
 
+from functools import lru_cache
+
 import arrow
-from flask import Blueprint, abort, current_app, url_for
-from invenio_files_rest.models import ObjectVersion, as_bucket
+from flask import Blueprint, Response, abort, current_app, url_for
+from invenio_files_rest.models import FileInstance, ObjectVersion, as_bucket
+
+from zenodo_rdm.exporter.api import UNTIL_TAG
+from zenodo_rdm.exporter.blocks import (
+    directory_filename,
+    find_entry,
+    index_filename,
+    load_directory,
+    read_record,
+)
+from zenodo_rdm.exporter.serializers import SERIALIZERS
+from zenodo_rdm.exporter.writers import archive_name
 
 blueprint = Blueprint(
     "exporter",
@@ -65,3 +78,49 @@ def get_object_version_content(key, version_id=None):
     if not ov:
         abort(404, description="ObjectVersion not found")
     return ov.send_file()
+
+
+# Block directories are immutable once written, and small (one row per block of
+# index rows), so they are cached by file instance.
+@lru_cache(maxsize=32)
+def _load_directory(file_id):
+    with FileInstance.get(file_id).storage().open() as stream:
+        return load_directory(stream)
+
+
+def _get_sidecar_version(bucket, ov, filename):
+    """Return a sidecar (e.g. the index) written along with an archive version."""
+    until = ov.get_tags().get(UNTIL_TAG)
+    for version in ObjectVersion.get_versions(bucket, filename):
+        if version.get_tags().get(UNTIL_TAG) == until:
+            return version
+    abort(404, description="Index not found")
+
+
+@blueprint.route("/exporter/<path:key>/records/<record_id>")
+@blueprint.route("/exporter/<path:key>/<uuid:version_id>/records/<record_id>")
+def get_record_content(key, record_id, version_id=None):
+    """Read one record from a record archive, without downloading the archive."""
+    # Delta archives are named ``records-<format>-delta-<since>.tar.gz``
+    format = archive_name(key.rpartition("/")[2]).partition("-")[0]
+    if format not in SERIALIZERS or not key.endswith(".tar.gz"):
+        abort(404, description="Record archive not found")
+
+    bucket = _get_bucket()
+    ov = ObjectVersion.get(bucket, key, version_id)
+    if not ov:
+        abort(404, description="ObjectVersion not found")
+
+    # Only the index block of the record is read
+    directory = _load_directory(
+        _get_sidecar_version(bucket, ov, directory_filename(ov.key)).file_id
+    )
+    index = _get_sidecar_version(bucket, ov, index_filename(ov.key))
+    with index.file.storage().open() as stream:
+        entry = find_entry(stream, directory, record_id)
+    if not entry:
+        abort(404, description="Record not found")
+
+    with ov.file.storage().open() as stream:
+        content = read_record(stream, entry)
+    return Response(content, mimetype=SERIALIZERS[format].mimetype)
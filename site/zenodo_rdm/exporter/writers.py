@@ -4,16 +4,27 @@
 
 import csv
 import gzip
-import json
+import shutil
 import tarfile
+import time
 from collections.abc import Iterable, Mapping, Sequence
 from contextlib import ExitStack
-from io import BytesIO
+from io import StringIO, TextIOWrapper
 from pathlib import Path
+from typing import BinaryIO
 
 from flask import current_app
-from invenio_rdm_records.oai import oai_datacite_etree
-from lxml import etree
+
+from zenodo_rdm.exporter import parquet
+from zenodo_rdm.exporter.blocks import (
+    BlockWriter,
+    IndexWriter,
+    directory_filename,
+    index_filename,
+    merge_indexes,
+)
+from zenodo_rdm.exporter.serializers import SERIALIZERS
+from zenodo_rdm.stats.utils import chunkify
 
 DELETED_HEADER = (
     "record_id",
@@ -26,95 +37,293 @@ DELETED_HEADER = (
     "citation_text",
 )
 
+# Two empty blocks mark the end of a tar archive. Archives written as fragments
+# leave them out, so that fragments can be concatenated into a single archive.
+TAR_END = tarfile.NUL * tarfile.BLOCKSIZE * 2
 
-def _serialize_json(record):
-    return json.dumps(record).encode()
+# Number of records serialized at once
+BATCH_SIZE = 500
 
+# Formats written as one table of all records, instead of one file per record
+TABLE_FORMATS = ("parquet",)
+
+EXPORT_FORMATS = (*SERIALIZERS, *TABLE_FORMATS)
+
+
+def _archive_filename(format):
+    if format in TABLE_FORMATS:
+        return f"records-{format}.{format}"
+    return f"records-{format}.tar.gz"
+
+
+def _part_filename(filename, number):
+    stem, _, suffix = filename.partition(".")
+    return f"{stem}.part-{number:04d}.{suffix}"
 
-def _serialize_xml(record):
-    tree = oai_datacite_etree(None, {"_source": record})
-    return etree.tostring(
-        tree,
-        xml_declaration=True,
-        encoding="UTF-8",
-    )
 
+def archive_filenames(formats: Sequence[str]) -> list[str]:
+    """Return the names of the files written for the given formats.
 
-SERIALIZERS = {
-    "json": _serialize_json,
-    "xml": _serialize_xml,
-}
-EXPORT_FORMATS = tuple(SERIALIZERS)
+    These are the record archives, the index sidecars of the tar archives and
+    their block directories, and the deleted records.
+    """
+    archives = [_archive_filename(format) for format in formats]
+    tar_archives = [archive for archive in archives if archive.endswith(".tar.gz")]
+    return [
+        *archives,
+        *(index_filename(archive) for archive in tar_archives),
+        *(directory_filename(archive) for archive in tar_archives),
+        "records-deleted.csv.gz",
+    ]
+
+
+def archive_paths(run_path: Path, formats: Sequence[str]) -> list[Path]:
+    """Return the paths written by ``write_archives`` for the given formats."""
+    return [run_path / filename for filename in archive_filenames(formats)]
+
+
+def archive_name(filename: str) -> str:
+    """Return the archive name (record format or ``deleted``) of a written file."""
+    return filename.split(".")[0].removeprefix("records-")
 
 
 def write_archives(
     run_path: Path,
     formats: Sequence[str],
     records: Iterable[Mapping],
+    complete: bool = True,
 ) -> list[Path]:
-    """Write one set of records to all requested formats."""
-    record_paths = {format: run_path / f"records-{format}.tar.gz" for format in formats}
-    deleted_path = run_path / "records-deleted.csv.gz"
+    """Write one set of records to all requested formats.
+
+    With ``complete=False`` the files are written as fragments: the tar archives
+    have no end-of-archive marker and the CSV files have no header.
+    Fragments are turned into complete files with ``merge_archives``.
+    """
+    paths = archive_paths(run_path, formats)
+    with ExitStack() as stack:
+        streams = [stack.enter_context(path.open("wb")) for path in paths]
+        write_streams(streams, formats, records, complete=complete)
+    return paths
+
+
+def write_streams(
+    streams: Sequence[BinaryIO],
+    formats: Sequence[str],
+    records: Iterable[Mapping],
+    complete: bool = True,
+):
+    """Write one set of records to all requested formats, into binary streams.
+
+    The streams are given in the order of ``archive_filenames`` and are left
+    open, so they can be pipes to a storage backend as well as local files.
+    Table formats (e.g. ``parquet``) are always written as complete files.
+    """
+    streams = dict(zip(archive_filenames(formats), streams))
 
     with ExitStack() as stack:
         archives = {}
-        for format, path in record_paths.items():
-            stream = stack.enter_context(path.open("wb"))
-            archives[format] = stack.enter_context(
-                tarfile.open(fileobj=stream, mode="w|gz")
-            )
+        for format in formats:
+            filename = _archive_filename(format)
+            if format in TABLE_FORMATS:
+                archive = parquet.ParquetArchive(
+                    streams[filename],
+                    current_app.config["EXPORTER_PARQUET_ROW_GROUP_SIZE"],
+                )
+            else:
+                index_writer = IndexWriter(
+                    streams[index_filename(filename)],
+                    streams[directory_filename(filename)],
+                    header=complete,
+                    buffer_size=current_app.config["EXPORTER_INDEX_BUFFER_SIZE"],
+                )
+                stack.callback(index_writer.close)
+                archive = _TarArchive(
+                    format,
+                    BlockWriter(
+                        streams[filename],
+                        index_writer,
+                        current_app.config["EXPORTER_BLOCK_SIZE"],
+                    ),
+                    complete,
+                )
+            archives[format] = archive
+            # Archives are closed before their index
+            stack.callback(archive.close)
 
-        deleted = stack.enter_context(
-            gzip.open(
-                deleted_path,
-                mode="wt",
-                encoding="utf-8",
-                newline="",
-            )
+        deleted_writer = _csv_writer(stack, streams["records-deleted.csv.gz"])
+        if complete:
+            deleted_writer.writerow(DELETED_HEADER)
+
+        durations = dict.fromkeys(formats, 0.0)
+        index = serialized = 0
+        for batch in chunkify(records, BATCH_SIZE):
+            current_app.logger.debug(f"Record index: {index:_}")
+            index += len(batch)
+            serialized += _write_batch(batch, archives, deleted_writer, durations)
+
+    for format, duration in durations.items():
+        rate = serialized / duration if duration else 0
+        current_app.logger.info(
+            f"Serialized {serialized:_} records to {format} in {duration:.1f}s "
+            f"({rate:.1f} records/sec)"
         )
-        deleted_writer = csv.writer(deleted)
-        deleted_writer.writerow(DELETED_HEADER)
-
-        for index, record in enumerate(records):
-            if index % 1000 == 0:
-                current_app.logger.debug(f"Record index: {index:_}")
-            _write_record(record, formats, archives, deleted_writer)
-
-    return [*record_paths.values(), deleted_path]
-
-
-def _write_record(record, formats, archives, deleted_writer):
-    record_id = record.get("id")
-    if not record_id:
-        return
-
-    if record.get("deletion_status", {}).get("is_deleted", False):
-        tombstone = record.get("tombstone", {})
-        removal_reason = tombstone.get("removal_reason", {}).get("id")
-        deleted_writer.writerow(
-            [
-                record_id,
-                record["pids"]["doi"]["identifier"],
-                record.get("parent", {}).get("id"),
-                record.get("parent", {})
-                .get("pids", {})
-                .get("doi", {})
-                .get("identifier"),
-                tombstone.get("note"),
-                removal_reason,
-                tombstone.get("removal_date"),
-                tombstone.get("citation_text") if removal_reason != "spam" else None,
+
+
+def merge_archives(
+    run_path: Path,
+    formats: Sequence[str],
+    fragments: Sequence[Sequence[Path]],
+    multipart: bool = False,
+) -> list[Path]:
+    """Merge the fragments written by ``write_archives`` into complete files.
+
+    Gzip members can be concatenated, so fragments are merged by copying their
+    bytes, and their indexes are merged by shifting the block offsets. Tables
+    are merged one row group at a time. With ``multipart=True`` every fragment
+    is published as one complete part of the record archives, instead of being
+    concatenated into one archive. The deleted records CSV is always merged into
+    a single file.
+    """
+    fragments = [{path.name: path for path in fragment} for fragment in fragments]
+    tar_end = gzip.compress(TAR_END, mtime=0)
+
+    archive_parts, index_parts, directory_parts = [], [], []
+    for format in formats:
+        filename = _archive_filename(format)
+        if multipart:
+            targets = [
+                (run_path / _part_filename(filename, number), [fragment])
+                for number, fragment in enumerate(fragments, start=1)
             ]
+        else:
+            targets = [(run_path / filename, fragments)]
+
+        for path, sources in targets:
+            archive_parts.append(path)
+            if format in TABLE_FORMATS:
+                with path.open("wb") as stream:
+                    parquet.merge_tables(
+                        [source[filename] for source in sources], stream
+                    )
+            else:
+                parts = [
+                    (source[filename], source[index_filename(filename)])
+                    for source in sources
+                ]
+                index_path, directory_path = _merge_parts(path, parts, tar_end)
+                index_parts.append(index_path)
+                directory_parts.append(directory_path)
+
+    deleted_path = run_path / "records-deleted.csv.gz"
+    with deleted_path.open("wb") as stream:
+        stream.write(gzip.compress(_csv_row(DELETED_HEADER), mtime=0))
+        for fragment in fragments:
+            _copy_file(fragment[deleted_path.name], stream)
+
+    return [*archive_parts, *index_parts, *directory_parts, deleted_path]
+
+
+def _merge_parts(path, parts, tar_end):
+    """Concatenate tar archive fragments and merge their indexes.
+
+    Returns the paths of the merged index and of its block directory.
+    """
+    sources = []
+    with path.open("wb") as stream:
+        for archive, index in parts:
+            sources.append((index, stream.tell()))
+            _copy_file(archive, stream)
+        stream.write(tar_end)
+
+    index_path = path.with_name(index_filename(path.name))
+    directory_path = path.with_name(directory_filename(path.name))
+    with index_path.open("wb") as stream, directory_path.open("wb") as directory:
+        merge_indexes(sources, stream, directory)
+    return index_path, directory_path
+
+
+def _csv_writer(stack, stream):
+    """Return a CSV writer to a gzipped binary stream."""
+    text = stack.enter_context(
+        TextIOWrapper(
+            gzip.GzipFile(fileobj=stream, mode="wb"),
+            encoding="utf-8",
+            newline="",
         )
-        return
+    )
+    return csv.writer(text)
 
-    for format in formats:
-        try:
-            content = SERIALIZERS[format](record)
-        except Exception:
-            current_app.logger.exception(f"Could not serialize record: {record_id}")
-            raise
-
-        info = tarfile.TarInfo(f"{record_id}.{format}")
-        info.size = len(content)
-        archives[format].addfile(info, fileobj=BytesIO(content))
+
+def _copy_file(path, stream):
+    with path.open("rb") as source:
+        shutil.copyfileobj(source, stream)
+
+
+def _csv_row(row):
+    buffer = StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue().encode("utf-8")
+
+
+class _TarArchive:
+    """Tar archive with one member per record, serialized in a record format."""
+
+    def __init__(self, format, blocks, complete):
+        """Constructor."""
+        self._format = format
+        self._serializer = SERIALIZERS[format]()
+        self._blocks = blocks
+        self._complete = complete
+
+    def write_batch(self, records):
+        """Serialize and write a batch of records."""
+        contents = self._serializer.serialize_batch(records)
+        for record, content in zip(records, contents):
+            self._blocks.write_member(
+                record["id"], f"{record['id']}.{self._format}", content
+            )
+
+    def close(self):
+        """Write the end of the archive, unless it is a fragment."""
+        if self._complete:
+            self._blocks.write(TAR_END)
+        self._blocks.flush()
+
+
+def _write_batch(batch, archives, deleted_writer, durations):
+    """Write a batch of records and return the number of serialized records.
+
+    The time spent writing each format is added to ``durations``.
+    """
+    published = []
+    for record in batch:
+        if not record.get("id"):
+            continue
+        if record.get("deletion_status", {}).get("is_deleted", False):
+            _write_deleted(record, deleted_writer)
+        else:
+            published.append(record)
+
+    for format, archive in archives.items():
+        start = time.perf_counter()
+        archive.write_batch(published)
+        durations[format] += time.perf_counter() - start
+
+    return len(published)
+
+
+def _write_deleted(record, deleted_writer):
+    tombstone = record.get("tombstone", {})
+    removal_reason = tombstone.get("removal_reason", {}).get("id")
+    deleted_writer.writerow(
+        [
+            record["id"],
+            record["pids"]["doi"]["identifier"],
+            record.get("parent", {}).get("id"),
+            record.get("parent", {}).get("pids", {}).get("doi", {}).get("identifier"),
+            tombstone.get("note"),
+            removal_reason,
+            tombstone.get("removal_date"),
+            tombstone.get("citation_text") if removal_reason != "spam" else None,
+        ]
+    )
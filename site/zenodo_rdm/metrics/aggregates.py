@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Incremental daily aggregates for metrics.
+
+Metrics over the whole history (e.g. the data transferred since the start of a
+project) are computed from per-day partial aggregates stored in the cache. Each
+refresh only aggregates the last few days, so that its cost does not grow with
+the history.
+"""
+
+from datetime import datetime, timedelta
+
+from flask import current_app
+from invenio_cache import current_cache
+from invenio_search import current_search_client
+from invenio_search.utils import build_alias_name
+from opensearchpy import Search
+
+from zenodo_rdm.metrics.proxies import current_metrics
+
+
+def get_daily_aggregates(key, index, aggregation, field, date_field="timestamp"):
+    """Return the per-day values of an aggregation, by ISO date.
+
+    Stored days older than ``METRICS_AGGREGATES_REFRESH_DAYS`` are not
+    aggregated again. More recent days (including the current, incomplete day)
+    are, to include documents that are indexed late.
+    """
+    cache_key = f"METRICS_AGGREGATES::{key}"
+    days = current_cache.get(cache_key) or {}
+
+    start = current_metrics.metrics_start_date
+    if days:
+        refresh_days = current_app.config["METRICS_AGGREGATES_REFRESH_DAYS"]
+        last_day = datetime.fromisoformat(max(days))
+        start = max(start, last_day - timedelta(days=refresh_days))
+
+    search = (
+        Search(using=current_search_client, index=build_alias_name(index))
+        .filter("range", **{date_field: {"gte": start.date().isoformat()}})
+        .params(request_timeout=120)
+    )
+    search.aggs.bucket(
+        "days",
+        "date_histogram",
+        field=date_field,
+        calendar_interval="day",
+        format="yyyy-MM-dd",
+    ).metric("value", aggregation, field=field)
+    result = search[:0].execute().aggregations.to_dict()
+
+    for bucket in result.get("days", {}).get("buckets", []):
+        days[bucket["key_as_string"]] = bucket.get("value", {}).get("value") or 0
+
+    current_cache.set(cache_key, days, timeout=-1)
+    return days
@@ -10,11 +10,9 @@ from flask import current_app
 from invenio_accounts.models import User
 from invenio_communities.communities.records.models import CommunityMetadata
 from invenio_files_rest.models import FileInstance
-from invenio_search import current_search_client
-from invenio_search.utils import build_alias_name
-from opensearchpy import Search
 
-from zenodo_rdm.metrics.proxies import current_metrics
+from zenodo_rdm.metrics.aggregates import get_daily_aggregates
+from zenodo_rdm.metrics.counts import count_rows
 
 
 class ZenodoMetric(object):
@@ -23,57 +21,27 @@ class ZenodoMetric(object):
     @staticmethod
     def get_data_transfer():
         """Get file transfer volume in TB."""
-        time_range = {"gte": current_metrics.metrics_start_date.isoformat()}
-
-        search = (
-            Search(
-                using=current_search_client,
-                index=build_alias_name("stats-file-download"),
-            )
-            .filter(
-                "range",
-                timestamp=time_range,
-            )
-            .params(request_timeout=120)
+        download_volume = get_daily_aggregates(
+            "download_volume", "stats-file-download", "sum", "volume"
         )
-        search.aggs.metric("download_volume", "sum", field="volume")
-        result = search[:0].execute().aggregations.to_dict()
-        download_volume = result.get("download_volume", {}).get("value", 0)
-
-        search = (
-            Search(
-                using=current_search_client,
-                index=build_alias_name("rdmrecords-records"),
-            )
-            .filter("range", created=time_range)
-            .params(request_timeout=120)
+        upload_volume = get_daily_aggregates(
+            "upload_volume",
+            "rdmrecords-records",
+            "sum",
+            "files.totalbytes",
+            date_field="created",
         )
-        search.aggs.metric("upload_volume", "sum", field="files.totalbytes")
-        result = search[:0].execute().aggregations.to_dict()
-        upload_volume = result.get("upload_volume", {}).get("value", 0)
-
-        return int(download_volume + upload_volume)
+        return int(sum(download_volume.values()) + sum(upload_volume.values()))
 
     @staticmethod
     def get_visitors():
         """Get number of unique zenodo users."""
-        time_range = {"gte": current_metrics.metrics_start_date.isoformat()}
-
-        search = (
-            Search(
-                using=current_search_client, index=build_alias_name("events-stats-*")
-            )
-            .filter("range", timestamp=time_range)
-            .params(request_timeout=120)
+        # Visitor IDs are anonymized with a daily salt, so the same visitor has
+        # a different ID every day, and daily unique visitors can be summed.
+        visitors = get_daily_aggregates(
+            "visitors", "events-stats-*", "cardinality", "visitor_id"
         )
-
-        search.aggs.metric("visitors_count", "cardinality", field="visitor_id")
-        result = search[:0].execute()
-
-        if "visitors_count" not in result.aggregations:
-            return 0
-
-        return int(result.aggregations.visitors_count.value)
+        return int(sum(visitors.values()))
 
     @staticmethod
     def get_uptime():
@@ -96,6 +64,7 @@ class ZenodoMetric(object):
                     "api_key": api_key,
                     "custom_uptime_ranges": f"{start_ts}_{end_ts}",
                 },
+                timeout=60,
             )
 
             return sum(
@@ -105,21 +74,27 @@ class ZenodoMetric(object):
             ) / len(metrics)
 
     @staticmethod
-    def get_researchers():
+    def get_researchers(estimate=False):
         """Get number of unique zenodo users."""
-        return User.query.filter(
+        return count_rows(
+            "researchers",
+            User,
             User.confirmed_at.isnot(None),
             User.active.is_(True),
-        ).count()
+            estimate=estimate,
+        )
 
     @staticmethod
-    def get_files():
+    def get_files(estimate=False):
         """Get number of files."""
-        return FileInstance.query.count()
+        return count_rows("files", FileInstance, estimate=estimate)
 
     @staticmethod
-    def get_communities():
+    def get_communities(estimate=False):
         """Get number of active communities."""
-        return CommunityMetadata.query.filter(
-            CommunityMetadata.is_deleted.is_(False)
-        ).count()
+        return count_rows(
+            "communities",
+            CommunityMetadata,
+            CommunityMetadata.is_deleted.is_(False),
+            estimate=estimate,
+        )
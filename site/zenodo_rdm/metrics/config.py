@@ -3,12 +3,19 @@
 """Configuration for ZenodoRDM Metrics."""
 
 import datetime
+from functools import partial
 
 from zenodo_rdm.metrics.api import ZenodoMetric
 
 METRICS_START_DATE = datetime.datetime(2021, 1, 1)
 METRICS_CACHE_TIMEOUT = int(datetime.timedelta(hours=1).total_seconds())
 METRICS_CACHE_UPDATE_INTERVAL = datetime.timedelta(minutes=30)
+METRICS_AGGREGATES_REFRESH_DAYS = 2
+METRICS_WORKERS = 4
+METRICS_TIMEOUT = 120  # seconds, unless a metric sets its own "timeout"
+# Row counts of large tables are estimated, and reconciled with an exact count
+# at this interval (see ``zenodo_rdm.metrics.counts``)
+METRICS_COUNT_RECONCILE_INTERVAL = datetime.timedelta(days=1)
 
 METRICS_DATA = {
     "openaire-nexus": [
@@ -40,13 +47,13 @@ METRICS_DATA = {
             "name": "zenodo_researchers",
             "help": "Number of researchers registered on Zenodo",
             "type": "gauge",
-            "value": ZenodoMetric.get_researchers,
+            "value": partial(ZenodoMetric.get_researchers, estimate=True),
         },
         {
             "name": "zenodo_files",
             "help": "Number of files hosted on Zenodo",
             "type": "gauge",
-            "value": ZenodoMetric.get_files,
+            "value": partial(ZenodoMetric.get_files, estimate=True),
         },
         {
             "name": "zenodo_communities",
@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Row counts for metrics, exact or estimated.
+
+Exact counts scan the whole table. Estimated counts scale the number of rows
+estimated by the PostgreSQL planner (``pg_class.reltuples``) with the ratio of
+matching rows found by the last exact count, which is reconciled every
+``METRICS_COUNT_RECONCILE_INTERVAL``.
+"""
+
+import time
+
+from flask import current_app
+from invenio_cache import current_cache
+from invenio_db import db
+from sqlalchemy import text
+
+
+def _estimate_rows(table):
+    """Return the planner estimate of the number of rows of a table."""
+    if db.engine.dialect.name != "postgresql":
+        return None
+    reltuples = db.session.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+        {"table": table},
+    ).scalar()
+    # Tables that were never analyzed have no estimate
+    if reltuples is None or reltuples <= 0:
+        return None
+    return reltuples
+
+
+def count_rows(key, model, *filters, estimate=False):
+    """Count the rows of a model matching the filters."""
+    cache_key = f"METRICS_COUNT::{key}"
+    reltuples = _estimate_rows(model.__tablename__) if estimate else None
+    if reltuples is not None:
+        last_count = current_cache.get(cache_key)
+        interval = current_app.config["METRICS_COUNT_RECONCILE_INTERVAL"]
+        if (
+            last_count
+            and time.time() - last_count["timestamp"] < interval.total_seconds()
+        ):
+            return round(reltuples * last_count["ratio"])
+
+    count = model.query.filter(*filters).count()
+    if reltuples is not None:
+        current_cache.set(
+            cache_key,
+            {"ratio": count / reltuples, "timestamp": time.time()},
+            timeout=-1,
+        )
+    return count
@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Utilities for metrics module."""
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 
 from flask import current_app
@@ -15,19 +17,59 @@ def get_metrics(metric_id):
         return cached_data
 
 
+def _evaluate(app, func):
+    """Evaluate a metric in its own application context."""
+    with app.app_context():
+        return func()
+
+
 def calculate_metrics(metric_id, cache=True):
-    """Calculate a metric's result."""
+    """Calculate a metric's result.
+
+    Metrics are evaluated concurrently, each within its ``timeout`` (or
+    ``METRICS_TIMEOUT``). A metric that fails or times out keeps its last
+    calculated value. Every metric has a ``<name>_age_seconds`` gauge, with the
+    time since its value was calculated.
+    """
     metrics = deepcopy(current_app.config["METRICS_DATA"][metric_id])
+    last_values = current_cache.get(f"METRICS_LAST_VALUES::{metric_id}") or {}
+    now = time.time()
+
+    app = current_app._get_current_object()
+    executor = ThreadPoolExecutor(max_workers=current_app.config["METRICS_WORKERS"])
+    futures = [executor.submit(_evaluate, app, metric["value"]) for metric in metrics]
+    started = time.monotonic()
 
     result = []
-    for metric in metrics:
-        try:
-            metric["value"] = metric["value"]()
+    try:
+        for metric, future in zip(metrics, futures):
+            timeout = metric.pop("timeout", current_app.config["METRICS_TIMEOUT"])
+            try:
+                value = future.result(
+                    timeout=max(0, started + timeout - time.monotonic())
+                )
+                last_values[metric["name"]] = {"value": value, "timestamp": now}
+            except Exception:
+                current_app.logger.exception(
+                    "Metric evaluation failed", extra={"metric": metric["name"]}
+                )
+
+            last_value = last_values.get(metric["name"])
+            if last_value is None:
+                continue
+            metric["value"] = last_value["value"]
             result.append(metric)
-        except Exception:
-            current_app.logger.exception(
-                "Metric evaluation failed", extra={"metric": metric["name"]}
+            result.append(
+                {
+                    "name": f"{metric['name']}_age_seconds",
+                    "help": f"Seconds since {metric['name']} was calculated.",
+                    "type": "gauge",
+                    "value": int(now - last_value["timestamp"]),
+                }
             )
+    finally:
+        # Metrics that timed out are left running, but their result is ignored
+        executor.shutdown(wait=False, cancel_futures=True)
 
     if cache:
         current_cache.set(
@@ -35,6 +77,7 @@ def calculate_metrics(metric_id, cache=True):
             result,
             timeout=current_app.config["METRICS_CACHE_TIMEOUT"],
         )
+        current_cache.set(f"METRICS_LAST_VALUES::{metric_id}", last_values, timeout=-1)
 
     return result
 
@@ -57,6 +57,21 @@ MODERATION_COMMUNITY_SCORE_RULES = {
 }
 """Scoring rules for communtiy moderation."""
 
+MODERATION_RULES_TIME_BUDGET = 5
+"""Time (in seconds) to wait for the I/O-bound rules of a moderation run."""
+
+MODERATION_RULES_TIMEOUT_SCORE = 0
+"""Score of I/O-bound rules that did not finish within the time budget."""
+
+MODERATION_RULES_WORKERS = 8
+"""Number of threads running I/O-bound rules, shared by all moderation runs."""
+
+MODERATION_SCORES_CACHE_TIMEOUT = 7 * 24 * 60 * 60  # 7 days
+"""Time (in seconds) memoized rule scores are reused for identical inputs."""
+
+MODERATION_USER_REQUEST_CACHE_TIMEOUT = 300  # 5 minutes
+"""Time (in seconds) the moderation request ID of a user is cached."""
+
 MODERATION_PERCOLATOR_INDEX_PREFIX = "moderation-queries"
 """Index Prefix for percolator index."""
 
@@ -69,3 +84,9 @@ MODERATION_PERCOLATOR_MAPPING = {
     }
 }
 """Properties for moderation percolator index."""
+
+MODERATION_BULK_SIZE = 1000
+"""Number of moderation queries or domains per bulk insert or indexing request."""
+
+MODERATION_PERCOLATE_MAX_QUERIES = 10_000
+"""Maximum number of matching queries returned when percolating in bulk."""
@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""In-memory lookup of moderated link domains.
+
+The link domains are loaded from the database into a process-local trie of
+reversed domain labels (e.g. ``com`` -> ``example`` -> ``blog``), so that the
+most specific domain of a URL is found without a database query. The trie is
+rebuilt when the version stamp stored in the cache changes, which happens every
+time the domains are modified (see ``bump_domains_version``).
+"""
+
+import threading
+from collections import namedtuple
+from uuid import uuid4
+
+from invenio_cache import current_cache
+
+from .models import LinkDomain
+
+VERSION_CACHE_KEY = "moderation:link_domains:version"
+
+DomainEntry = namedtuple("DomainEntry", ["domain", "status", "score", "reason"])
+"""Detached copy of a ``LinkDomain``, safe to share between requests."""
+
+_ENTRY = object()
+
+
+class DomainTrie:
+    """Trie of reversed domain labels, for longest-suffix domain lookups."""
+
+    def __init__(self, entries=(), version=None):
+        """Constructor."""
+        self.version = version
+        self._root = {}
+        for entry in entries:
+            self.add(entry)
+
+    @staticmethod
+    def _labels(reversed_domain):
+        return reversed_domain.strip(".").split(".")
+
+    def add(self, entry):
+        """Add a domain entry to the trie."""
+        node = self._root
+        for label in self._labels(entry.domain):
+            node = node.setdefault(label, {})
+        node[_ENTRY] = entry
+
+    def lookup(self, reversed_domain):
+        """Return the entry of the most specific domain matching, if any."""
+        match = None
+        node = self._root
+        for label in self._labels(reversed_domain):
+            node = node.get(label)
+            if node is None:
+                break
+            match = node.get(_ENTRY, match)
+        return match
+
+    def lookup_url(self, url):
+        """Return the entry of the most specific domain of a URL, if any."""
+        reversed_domain = LinkDomain.reverse_url_domain(url)
+        if reversed_domain is None:
+            return None
+        return self.lookup(reversed_domain)
+
+    @classmethod
+    def load(cls, version=None):
+        """Build the trie from the link domains in the database."""
+        rows = LinkDomain.query.with_entities(
+            LinkDomain.domain, LinkDomain.status, LinkDomain.score, LinkDomain.reason
+        )
+        return cls((DomainEntry(*row) for row in rows), version=version)
+
+
+_trie = None
+_trie_lock = threading.Lock()
+
+
+def get_domain_trie():
+    """Return the domain trie, rebuilt if the domains were modified."""
+    global _trie
+
+    version = get_domains_version()
+    trie = _trie
+    if trie is not None and trie.version == version:
+        return trie
+
+    with _trie_lock:
+        # Another thread might have rebuilt the trie in the meantime
+        if _trie is None or _trie.version != version:
+            _trie = DomainTrie.load(version=version)
+        return _trie
+
+
+def get_domains_version():
+    """Return the version stamp of the link domains."""
+    version = current_cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        # The stamp was never set, or was evicted from the cache
+        version = bump_domains_version()
+    return version
+
+
+def bump_domains_version():
+    """Mark the link domains as modified, so that all processes reload them."""
+    version = uuid4().hex
+    current_cache.set(VERSION_CACHE_KEY, version, timeout=-1)
+    return version
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """ZenodoRDM Moderation module."""
 
+from concurrent.futures import ThreadPoolExecutor
 from types import SimpleNamespace
 
 from flask import current_app
@@ -34,3 +35,11 @@ class ZenodoModeration:
     def scores(self):
         """Return moderation score values used in rules."""
         return SimpleNamespace(**current_app.config.get("MODERATION_SCORES", {}))
+
+    @cached_property
+    def executor(self):
+        """Return the thread pool running I/O-bound moderation rules."""
+        return ThreadPoolExecutor(
+            max_workers=current_app.config["MODERATION_RULES_WORKERS"],
+            thread_name_prefix="moderation-rule",
+        )
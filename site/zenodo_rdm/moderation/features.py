@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Features of records and communities used by the moderation rules.
+
+The metadata is walked once per moderation run, and the extracted features are
+shared by all rules, instead of every rule scanning the metadata again.
+"""
+
+import re
+
+from .models import LinkDomain
+
+LINKS_PATTERN = re.compile(
+    r'href=["\']?([^"\'>]+)|\b(https?://[^\s\'"<>,]+|www\.[^\s\'"<>,]+)',
+)
+
+HEADER_TAG_PATTERN = re.compile(r"<h[1-9]\b[^>]*>", re.IGNORECASE)
+
+EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001f600-\U0001f64f"  # Emoticons
+    "\U0001f300-\U0001f5ff"  # Symbols & Pictographs
+    "\U0001f680-\U0001f6ff"  # Transport & Map Symbols
+    "\U0001f1e0-\U0001f1ff"  # Flags (iOS)
+    "\U00002700-\U000027bf"  # Dingbats
+    "\U000024c2-\U0001f251"  # Enclosed characters
+    "]+",
+    flags=re.UNICODE,
+)
+
+
+def find_links(text):
+    """Find all URLs in a text."""
+    return [url for match in LINKS_PATTERN.findall(text) for url in match if url]
+
+
+def _walk_strings(value, path=()):
+    """Yield the strings of a metadata value, with the keys leading to them."""
+    if isinstance(value, str):
+        yield path, value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _walk_strings(item, (*path, key))
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _walk_strings(item, path)
+
+
+class ModerationFeatures:
+    """Features extracted from the metadata of a record or community."""
+
+    def __init__(self, metadata):
+        """Extract the features of the metadata."""
+        self.links = []
+        self.description_links = []
+        self.emoji_count = 0
+        self.header_tag_count = 0
+        self.text_length = 0
+
+        for path, text in _walk_strings(metadata):
+            links = find_links(text)
+            self.links.extend(links)
+            if path == ("description",):
+                self.description_links.extend(links)
+            self.emoji_count += len(EMOJI_PATTERN.findall(text))
+            self.header_tag_count += len(HEADER_TAG_PATTERN.findall(text))
+            self.text_length += len(text)
+
+        self.domains = [LinkDomain.reverse_url_domain(link) for link in self.links]
+
+    @classmethod
+    def from_record(cls, record):
+        """Extract the features of a record or community."""
+        return cls(record.metadata or {})
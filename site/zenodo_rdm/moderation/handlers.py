@@ -23,9 +23,15 @@ Moderation actions are based on the following logic:
   admins manually.
 """
 
+import hashlib
+import json
+import time
+from concurrent.futures import TimeoutError
+
 import invenio_rdm_records.services.communities.moderation as community_moderation
 from flask import current_app
 from invenio_access.permissions import system_identity
+from invenio_cache import current_cache
 from invenio_rdm_records.services.components.verified import BaseHandler
 from invenio_records_resources.services.uow import RecordCommitOp, TaskOp
 from invenio_users_resources.proxies import current_users_service as users_service
@@ -34,11 +40,26 @@ from invenio_users_resources.services.users.tasks import execute_moderation_acti
 from werkzeug.utils import cached_property
 
 from .errors import UserBlockedException
-from .proxies import current_scores
+from .features import ModerationFeatures
+from .proxies import current_moderation, current_scores
 from .tasks import run_moderation_handlers, update_moderation_request
 from .uow import ExceptionOp
 
 
+def _score_cache_key(name, inputs):
+    """Return the cache key of the score of a rule for given inputs."""
+    digest = hashlib.sha256(
+        json.dumps([name, inputs], sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"moderation:score:{digest}"
+
+
+def _run_score(app, score, data):
+    """Run the I/O part of a moderation rule in its own application context."""
+    with app.app_context():
+        return score(**data)
+
+
 class BaseModerationHandler:
     """Base handler to calculate moderation scores based on rules."""
 
@@ -53,6 +74,76 @@ class BaseModerationHandler:
             return current_app.config[self._rules]
         return self._rules or {}
 
+    def run_rules(self, identity, draft=None, record=None):
+        """Calculate the score of every rule.
+
+        Rules with memoized scores are skipped when a score was already
+        calculated for the same inputs. The I/O of I/O-bound rules runs
+        concurrently on a thread pool, while the other rules run in the current
+        thread. Only plain data read from the record in the current thread is
+        passed to the pool, since the record belongs to the database session of
+        the current thread. I/O-bound rules that do not finish within
+        ``MODERATION_RULES_TIME_BUDGET`` get ``MODERATION_RULES_TIMEOUT_SCORE``.
+        """
+        # Features of the metadata are extracted once, and shared by all rules
+        features = ModerationFeatures.from_record(record)
+        kwargs = {"draft": draft, "record": record, "features": features}
+        deadline = time.monotonic() + current_app.config["MODERATION_RULES_TIME_BUDGET"]
+
+        cache_keys = {
+            name: _score_cache_key(name, rule.inputs(record, features))
+            for name, rule in self.rules.items()
+            if getattr(rule, "inputs", None)
+        }
+        cached = current_cache.get_many(*cache_keys.values()) if cache_keys else []
+        results = {
+            name: score for name, score in zip(cache_keys, cached) if score is not None
+        }
+        rules = {name: rule for name, rule in self.rules.items() if name not in results}
+
+        app = current_app._get_current_object()
+        futures = {
+            name: current_moderation.executor.submit(
+                _run_score, app, rule.score, rule.prepare(record, features)
+            )
+            for name, rule in rules.items()
+            if getattr(rule, "prepare", None)
+        }
+
+        calculated = {}
+        for name, rule in rules.items():
+            if name not in futures:
+                calculated[name] = rule(identity, **kwargs)
+
+        for name, future in futures.items():
+            try:
+                calculated[name] = future.result(
+                    timeout=max(0, deadline - time.monotonic())
+                )
+            except TimeoutError:
+                future.cancel()
+                results[name] = current_app.config["MODERATION_RULES_TIMEOUT_SCORE"]
+                current_app.logger.warning(
+                    "Moderation rule timed out",
+                    extra={"rule": name, "record_id": str(record.id)},
+                )
+
+        # Scores of rules that timed out are not memoized
+        memoized = {
+            cache_keys[name]: score
+            for name, score in calculated.items()
+            if name in cache_keys
+        }
+        if memoized:
+            current_cache.set_many(
+                memoized,
+                timeout=current_app.config["MODERATION_SCORES_CACHE_TIMEOUT"],
+            )
+
+        results.update(calculated)
+        # Keep the results in the order of the rules
+        return {name: results[name] for name in self.rules}
+
     def evaluate_result(self, params):
         """Evaluate aggregate result based on params."""
         return sum(params.values())
@@ -76,9 +167,7 @@ class BaseModerationHandler:
                 )
                 return
 
-            results = {}
-            for name, rule in self.rules.items():
-                results[name] = rule(identity, draft=draft, record=record)
+            results = self.run_rules(identity, draft=draft, record=record)
 
             evaluation = self.evaluate_result(results)
             action_ctx = {
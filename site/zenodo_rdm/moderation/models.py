@@ -3,9 +3,12 @@
 """Moderation models."""
 
 import enum
+from datetime import datetime
 from urllib.parse import urlparse
 
 from invenio_db import db
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy_utils import ChoiceType, Timestamp
 
 
@@ -32,18 +35,51 @@ class LinkDomain(db.Model, Timestamp):
     score = db.Column(db.Integer, nullable=True)
     reason = db.Column(db.Text, nullable=True)
 
+    @staticmethod
+    def reverse_domain(domain):
+        """Return a domain with its labels reversed (e.g. ``.com.example``)."""
+        parts = domain.strip(".").split(".")
+        return "." + ".".join(parts[::-1]).lower()
+
     @classmethod
     def create(cls, domain, status, score=None, reason=None):
         """Create a link domain."""
-        parts = domain.strip(".").split(".")
-        domain = "." + ".".join(parts[::-1]).lower()
+        domain = cls.reverse_domain(domain)
         ld = cls(domain=domain, status=status, score=score, reason=reason)
         db.session.add(ld)
         return ld
 
     @classmethod
-    def lookup_domain(cls, url):
-        """Lookup the status of a URL's domain."""
+    def bulk_upsert(cls, entries):
+        """Create or update link domains, in a single statement.
+
+        Each entry is a dictionary with the ``domain``, ``status``, ``score`` and
+        ``reason`` of a link domain. Existing domains are updated.
+        """
+        values = {}
+        for entry in entries:
+            domain = cls.reverse_domain(entry["domain"])
+            # Postgres cannot update the same row twice in a statement
+            values[domain] = {**entry, "domain": domain}
+        if not values:
+            return
+
+        statement = pg_insert(cls).values(list(values.values()))
+        db.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[cls.domain],
+                set_={
+                    "status": statement.excluded.status,
+                    "score": statement.excluded.score,
+                    "reason": statement.excluded.reason,
+                    "updated": datetime.utcnow(),
+                },
+            )
+        )
+
+    @staticmethod
+    def reverse_url_domain(url):
+        """Return the reversed domain of a URL (e.g. ``.com.example``)."""
         try:
             parsed = urlparse(url)
         except ValueError:
@@ -55,7 +91,15 @@ class LinkDomain(db.Model, Timestamp):
         if not domain_parts:
             return None
 
-        reversed_domain = "." + ".".join(domain_parts[::-1]).lower()
+        return "." + ".".join(domain_parts[::-1]).lower()
+
+    @classmethod
+    def lookup_domain(cls, url):
+        """Lookup the status of a URL's domain."""
+        reversed_domain = cls.reverse_url_domain(url)
+        if reversed_domain is None:
+            return None
+
         return (
             cls.query.filter(
                 # Exact match
@@ -94,14 +138,44 @@ class ModerationQuery(db.Model):
     active = db.Column(db.Boolean, default=True)
     """Indicates whether the moderation query is currently active."""
 
+    record_cls = db.Column(db.String(32), nullable=True)
+    """Record class (``records`` or ``communities``) the query is indexed for.
+
+    Queries created before the record class was stored have none.
+    """
+
     @classmethod
-    def create(cls, query_string, notes=None, score=0, active=True):
+    def create(
+        cls, query_string, notes=None, score=0, active=True, record_cls="records"
+    ):
         """Create a new moderation query with a configurable record class."""
-        query = cls(query_string=query_string, notes=notes, score=score, active=active)
+        query = cls(
+            query_string=query_string,
+            notes=notes,
+            score=score,
+            active=active,
+            record_cls=record_cls,
+        )
         db.session.add(query)
 
         return query
 
+    @classmethod
+    def bulk_create(cls, entries):
+        """Create moderation queries in a single statement.
+
+        Each entry is a dictionary with the ``query_string``, ``notes``, ``score``,
+        ``active`` and ``record_cls`` of a query. Returns the IDs of the created
+        queries.
+        """
+        if not entries:
+            return []
+        return (
+            db.session.execute(insert(cls).values(entries).returning(cls.id))
+            .scalars()
+            .all()
+        )
+
     @classmethod
     def get(cls, query_id=None):
         """Retrieve a moderation query by ID or return all queries if no ID is provided."""
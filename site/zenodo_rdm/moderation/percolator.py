@@ -2,10 +2,33 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Percolator."""
 
+from datetime import datetime, timezone
+from uuid import uuid4
+
 from flask import current_app
+from invenio_cache import current_cache
 from invenio_search import current_search_client
+from invenio_search.engine import search as search_engine
 from invenio_search.utils import build_alias_name
 
+QUERIES_VERSION_CACHE_KEY = "moderation:queries:version"
+
+
+def get_queries_version():
+    """Return the version stamp of the indexed moderation queries."""
+    version = current_cache.get(QUERIES_VERSION_CACHE_KEY)
+    if version is None:
+        # The stamp was never set, or was evicted from the cache
+        version = bump_queries_version()
+    return version
+
+
+def bump_queries_version():
+    """Mark the indexed moderation queries as modified."""
+    version = uuid4().hex
+    current_cache.set(QUERIES_VERSION_CACHE_KEY, version, timeout=-1)
+    return version
+
 
 def get_percolator_index(record_cls):
     """Build the percolator index alias name for a given record class."""
@@ -14,17 +37,12 @@ def get_percolator_index(record_cls):
     return build_alias_name(combined_index, app=current_app)
 
 
-def create_percolator_index(record_cls):
-    """Create mappings with the percolator field for moderation queries.
+def _percolator_index_body(record_cls):
+    """Return the settings and mappings of the percolator index of a record class.
 
-    This function creates a new Elasticsearch index for percolator queries by copying
-    the settings and mappings from an existing record index and adding specific
-    percolator mappings.
+    The settings and mappings are copied from the record index, with the
+    percolator mappings added.
     """
-    # Build the name for the new percolator index, using a prefix and the record's index name
-    combined_index_name = f"{current_app.config.get('MODERATION_PERCOLATOR_INDEX_PREFIX')}-{record_cls.index._name}"
-    percolator_index = build_alias_name(combined_index_name)
-
     # Get the current mapping for the record index to copy its structure
     record_index = build_alias_name(record_cls.index._name)
     record_mapping = current_search_client.indices.get_mapping(index=record_index)
@@ -52,6 +70,20 @@ def create_percolator_index(record_cls):
         },
         "analysis": record_settings.get("analysis", {}),
     }
+    return percolator_settings, percolator_mappings
+
+
+def create_percolator_index(record_cls):
+    """Create mappings with the percolator field for moderation queries.
+
+    This function creates a new Elasticsearch index for percolator queries by copying
+    the settings and mappings from an existing record index and adding specific
+    percolator mappings.
+    """
+    # Build the name for the new percolator index, using a prefix and the record's index name
+    combined_index_name = f"{current_app.config.get('MODERATION_PERCOLATOR_INDEX_PREFIX')}-{record_cls.index._name}"
+    percolator_index = build_alias_name(combined_index_name)
+    percolator_settings, percolator_mappings = _percolator_index_body(record_cls)
 
     if not current_search_client.indices.exists(percolator_index):
         try:
@@ -93,5 +125,103 @@ def index_percolate_query(
                 "notes": notes,
             },
         )
+        bump_queries_version()
     except Exception as e:
         current_app.logger.exception(e)
+
+
+def _percolate_query_document(query):
+    """Return the percolator document of a moderation query."""
+    return {
+        "id": query.id,
+        "query": {"query_string": {"query": query.query_string}},
+        "active": query.active,
+        "score": query.score,
+        "notes": query.notes,
+    }
+
+
+def bulk_index_percolate_queries(record_cls, queries, index=None):
+    """Index moderation queries with bulk requests.
+
+    Queries are indexed by ID, so indexing a query again replaces it.
+    """
+    index = index or get_percolator_index(record_cls)
+    actions = (
+        {"_index": index, "_id": query.id, "_source": _percolate_query_document(query)}
+        for query in queries
+    )
+    result = search_engine.helpers.bulk(
+        current_search_client,
+        actions,
+        chunk_size=current_app.config["MODERATION_BULK_SIZE"],
+    )
+    bump_queries_version()
+    return result
+
+
+def rebuild_percolator_index(record_cls, queries):
+    """Rebuild the percolator index of a record class from moderation queries.
+
+    The queries are indexed into a new index, which then replaces the previous
+    one behind the percolator alias in a single atomic alias update. Searches
+    keep using the previous index until the new one is complete.
+    """
+    client = current_search_client
+    alias = get_percolator_index(record_cls)
+    index = f"{alias}-{datetime.now(timezone.utc):%Y%m%d%H%M%S}"
+
+    settings, mappings = _percolator_index_body(record_cls)
+    client.indices.create(
+        index=index, body={"settings": settings, "mappings": mappings}
+    )
+    bulk_index_percolate_queries(record_cls, queries, index=index)
+    client.indices.refresh(index=index)
+
+    actions = [{"add": {"index": index, "alias": alias}}]
+    previous_indices = []
+    if client.indices.exists_alias(name=alias):
+        previous_indices = list(client.indices.get_alias(name=alias))
+        actions += [
+            {"remove": {"index": previous, "alias": alias}}
+            for previous in previous_indices
+        ]
+    elif client.indices.exists(index=alias):
+        # The percolator index was created without an alias
+        actions.append({"remove_index": {"index": alias}})
+    client.indices.update_aliases(body={"actions": actions})
+    bump_queries_version()
+
+    for previous in previous_indices:
+        client.indices.delete(index=previous)
+    return index
+
+
+def percolate_scores(record_cls, documents):
+    """Return the total score of the active queries matching each document.
+
+    All documents are percolated in a single request.
+    """
+    scores = [0] * len(documents)
+    if not documents:
+        return scores
+
+    response = current_search_client.search(
+        index=get_percolator_index(record_cls),
+        body={
+            "query": {
+                "bool": {
+                    "must": [
+                        {"term": {"active": True}},
+                        {"percolate": {"field": "query", "documents": documents}},
+                    ]
+                }
+            },
+            "size": current_app.config["MODERATION_PERCOLATE_MAX_QUERIES"],
+        },
+    )
+    for hit in response["hits"]["hits"]:
+        # Positions of the documents matched by the query
+        for slot in hit["fields"]["_percolator_document_slot"]:
+            scores[slot] += hit["_source"].get("score", 0)
+    return scores
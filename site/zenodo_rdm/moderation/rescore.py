@@ -0,0 +1,182 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Re-calculate the moderation scores of published records in bulk.
+
+Records are streamed from the search index, and scored in batches by a pool of
+worker threads. The records of a batch are loaded from the database at once,
+and percolated against the moderation queries in a single (multi-document)
+request. The scores are written to a CSV report, along with the
+difference with the scores of a previous report.
+"""
+
+import csv
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_rdm_records.proxies import current_rdm_records_service as records_service
+from invenio_search import current_search_client
+from invenio_search.engine import dsl
+
+from zenodo_rdm.stats.utils import chunkify
+
+from .features import ModerationFeatures
+from .percolator import percolate_scores
+from .proxies import current_scores
+from .rules import match_query_rule
+from .tasks import run_moderation_handlers
+
+
+def _search_records(query=None, since=None, until=None):
+    """Yield the UUIDs of the published records matching a query and time range."""
+    search = dsl.Search(
+        using=current_search_client, index=records_service.record_cls.index.search_alias
+    ).source(["uuid"])
+    if query:
+        search = search.query("query_string", query=query)
+    created = {}
+    if since:
+        created["gte"] = since.isoformat()
+    if until:
+        created["lt"] = until.isoformat()
+    if created:
+        search = search.filter("range", created=created)
+
+    for hit in search.params(preserve_order=False).scan():
+        yield hit.uuid
+
+
+def get_action(evaluation):
+    """Return the moderation action of a moderation score."""
+    if evaluation > current_scores.spam_threshold:
+        return "block"
+    if evaluation < current_scores.ham_threshold:
+        return "approve"
+    return "moderate"
+
+
+def _score_batch(app, rules, uuids):
+    """Calculate the moderation scores of a batch of records.
+
+    Runs in a worker thread, with its own app context and database session.
+    Returns the record ID, owner, and rule scores of each record.
+    """
+    with app.app_context():
+        record_cls = records_service.record_cls
+        records = record_cls.get_records(uuids)
+        percolated = percolate_scores(
+            record_cls, [record.dumps() for record in records]
+        )
+
+        scored = []
+        for record, percolate_score in zip(records, percolated):
+            features = ModerationFeatures.from_record(record)
+            results = {}
+            for name, rule in rules.items():
+                if rule is match_query_rule:
+                    results[name] = percolate_score
+                else:
+                    results[name] = rule(
+                        system_identity, record=record, features=features
+                    )
+            scored.append(
+                (
+                    str(record.id),
+                    record.pid.pid_value,
+                    record.parent.access.owned_by.owner_id,
+                    results,
+                )
+            )
+        return scored
+
+
+def _load_report(path):
+    """Return the evaluations of a previous report, by record ID."""
+    with open(path, newline="", encoding="utf-8") as csvfile:
+        return {
+            row["record_id"]: int(row["evaluation"]) for row in csv.DictReader(csvfile)
+        }
+
+
+def _write_scores(writer, scored, previous, apply_actions):
+    """Write the scores of a batch of records to the report."""
+    for uuid, record_id, user_id, results in scored:
+        evaluation = sum(results.values())
+        action = get_action(evaluation)
+        previous_evaluation = previous.get(record_id)
+        delta = (
+            evaluation - previous_evaluation
+            if previous_evaluation is not None
+            else None
+        )
+        writer.writerow(
+            [
+                record_id,
+                user_id,
+                *results.values(),
+                evaluation,
+                action,
+                previous_evaluation,
+                delta,
+            ]
+        )
+
+        if action in apply_actions and user_id is not None:
+            run_moderation_handlers.delay(user_id=user_id, record_id=uuid)
+    return len(scored)
+
+
+def rescore_records(
+    report,
+    query=None,
+    since=None,
+    until=None,
+    previous_report=None,
+    apply_actions=(),
+    batch_size=500,
+    workers=4,
+):
+    """Re-calculate the moderation scores of records and write them to a report.
+
+    With ``apply_actions``, the moderation handlers are run again (as tasks) for
+    the records whose action (e.g. ``block``) is one of the given actions.
+    Returns the number of scored records.
+    """
+    rules = current_app.config["MODERATION_RECORD_SCORE_RULES"]
+    previous = _load_report(previous_report) if previous_report else {}
+    app = current_app._get_current_object()
+
+    count = 0
+    executor = ThreadPoolExecutor(max_workers=workers)
+    # Bound the number of batches loaded at once
+    in_flight = deque()
+    with executor, open(report, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(
+            [
+                "record_id",
+                "user_id",
+                *rules,
+                "evaluation",
+                "action",
+                "previous_evaluation",
+                "delta",
+            ]
+        )
+
+        for uuids in chunkify(_search_records(query, since, until), batch_size):
+            in_flight.append(executor.submit(_score_batch, app, rules, uuids))
+            if len(in_flight) >= 2 * workers:
+                count += _write_scores(
+                    writer, in_flight.popleft().result(), previous, apply_actions
+                )
+                current_app.logger.info(f"Re-scored {count:_} records")
+
+        while in_flight:
+            count += _write_scores(
+                writer, in_flight.popleft().result(), previous, apply_actions
+            )
+        current_app.logger.info(f"Re-scored {count:_} records")
+
+    return count
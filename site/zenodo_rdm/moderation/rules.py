@@ -2,31 +2,19 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Rules for moderation."""
 
-import re
-
 from flask import current_app
 from invenio_search import current_search_client
 
-from .models import LinkDomain, LinkDomainStatus
-from .percolator import get_percolator_index
+from .domains import get_domain_trie, get_domains_version
+from .features import EMOJI_PATTERN, ModerationFeatures, find_links
+from .models import LinkDomainStatus
+from .percolator import get_percolator_index, get_queries_version
 from .proxies import current_scores
 
+
 #
 # Utilities
 #
-EMOJI_PATTERN = re.compile(
-    "["
-    "\U0001f600-\U0001f64f"  # Emoticons
-    "\U0001f300-\U0001f5ff"  # Symbols & Pictographs
-    "\U0001f680-\U0001f6ff"  # Transport & Map Symbols
-    "\U0001f1e0-\U0001f1ff"  # Flags (iOS)
-    "\U00002700-\U000027bf"  # Dingbats
-    "\U000024c2-\U0001f251"  # Enclosed characters
-    "]+",
-    flags=re.UNICODE,
-)
-
-
 def extract_emojis(text):
     """Extract all emojis from text using a regex pattern."""
     return EMOJI_PATTERN.findall(text)
@@ -34,34 +22,78 @@ def extract_emojis(text):
 
 def extract_links(text):
     """Extract unique URLs from text using regex."""
-    url_pattern = re.compile(
-        r'href=["\']?([^"\'>]+)|\b(https?://[^\s\'"<>,]+|www\.[^\s\'"<>,]+)',
-    )
+    return find_links(text)
 
-    links = []
-    for match in url_pattern.findall(text):
-        for url in match:
-            if url:
-                links.append(url)
 
-    return links
+def memoized(inputs):
+    """Reuse the score of a rule for records with the same inputs.
 
+    ``inputs(record, features)`` returns the (JSON-serializable) values that
+    the score of the rule depends on.
+    """
 
-#
-# Rules
-#
-def links_rule(identity, draft=None, record=None):
-    """Calculate a moderation score based on links found in record metadata."""
+    def decorator(rule):
+        rule.inputs = inputs
+        return rule
+
+    return decorator
+
+
+def _links_inputs(record, features):
+    return {
+        "description_links": len(features.description_links),
+        "domains": features.domains,
+        "version": get_domains_version(),
+    }
+
+
+def _query_inputs(record, features):
+    files = getattr(record, "files", None)
+    return {
+        "metadata": record.get("metadata"),
+        "custom_fields": record.get("custom_fields"),
+        # Extensions and sizes of the files
+        "files": sorted(
+            (key.split(".")[-1].lower(), entry.file.size if entry.file else None)
+            for key, entry in (files.entries.items() if files else [])
+        ),
+        "version": get_queries_version(),
+    }
+
+
+def io_bound(prepare, score):
+    """Mark a rule as I/O-bound, so that its I/O runs concurrently with other rules.
+
+    ``prepare(record, features)`` reads the plain data the rule needs, in the
+    calling thread, since the record and its database session must not be used
+    from another thread. ``score(**data)`` does the I/O and returns the score,
+    and can run on a worker thread.
+    """
+
+    def decorator(rule):
+        rule.prepare = prepare
+        rule.score = score
+        return rule
+
+    return decorator
+
+
+def _links_data(record, features):
+    return {
+        "description_links_count": len(features.description_links),
+        "domains": features.domains,
+    }
+
+
+def _links_score(description_links_count, domains):
     score = 0
-    description_links = extract_links(str(record.metadata.get("description", "")))
 
-    if len(description_links) > 5:
+    if description_links_count > 5:
         score += current_scores.excess_links
 
-    extracted_links = extract_links(str(record.metadata))
-
-    for link in extracted_links:
-        domain = LinkDomain.lookup_domain(link)
+    trie = get_domain_trie()
+    for reversed_domain in domains:
+        domain = trie.lookup(reversed_domain) if reversed_domain else None
         if domain is None:
             continue
         default_score = (
@@ -77,22 +109,60 @@ def links_rule(identity, draft=None, record=None):
     return score
 
 
-def text_sanitization_rule(identity, draft=None, record=None):
+def _query_data(record, features):
+    return {"document": record.dumps(), "index": get_percolator_index(record)}
+
+
+def _query_score(document, index):
+    score = 0
+    if not index:
+        return score
+
+    matched_queries = current_search_client.search(
+        index=index,
+        body={
+            "query": {
+                "bool": {
+                    "must": [
+                        {"term": {"active": True}},
+                        {"percolate": {"field": "query", "document": document}},
+                    ]
+                }
+            },
+        },
+    )
+    for hit in matched_queries["hits"]["hits"]:
+        query_score = hit["_source"].get("score", 0)
+        score += query_score
+    return score
+
+
+#
+# Rules
+#
+@io_bound(_links_data, _links_score)
+@memoized(_links_inputs)
+def links_rule(identity, draft=None, record=None, features=None):
+    """Calculate a moderation score based on links found in record metadata."""
+    features = features or ModerationFeatures.from_record(record)
+    return _links_score(**_links_data(record, features))
+
+
+def text_sanitization_rule(identity, draft=None, record=None, features=None):
     """Calculate a score based on excessive emoji and HTML tag usage in metadata text."""
-    record_text = " ".join(map(str, record.metadata.values()))
-    htag_count = len(re.findall(r"<h[1-9]\b[^>]*>", record_text, re.IGNORECASE))
+    features = features or ModerationFeatures.from_record(record)
     score = 0
 
-    if len(extract_emojis(record_text)) > 3:
+    if features.emoji_count > 3:
         score += current_scores.spam_emoji
 
-    if htag_count > 4:
+    if features.header_tag_count > 4:
         score += current_scores.spam_header_tags
 
     return score
 
 
-def verified_user_rule(identity, draft=None, record=None):
+def verified_user_rule(identity, draft=None, record=None, features=None):
     """Adjust moderation score based on the verification status of the user."""
     is_verified = (
         getattr(record.parent, "is_verified", None)
@@ -106,7 +176,7 @@ def verified_user_rule(identity, draft=None, record=None):
     )
 
 
-def files_rule(identity, draft=None, record=None):
+def files_rule(identity, draft=None, record=None, features=None):
     """Calculate score based on the number, size, and type of files associated with the record."""
     score = 0
 
@@ -129,28 +199,8 @@ def files_rule(identity, draft=None, record=None):
     return score
 
 
-def match_query_rule(identity, draft=None, record=None):
+@io_bound(_query_data, _query_score)
+@memoized(_query_inputs)
+def match_query_rule(identity, draft=None, record=None, features=None):
     """Calculate a score based on matched percolate queries against the given document in the specified index."""
-    document = record.dumps()
-    percolator_index = get_percolator_index(record)
-    if percolator_index:
-        matched_queries = current_search_client.search(
-            index=percolator_index,
-            body={
-                "query": {
-                    "bool": {
-                        "must": [
-                            {"term": {"active": True}},
-                            {"percolate": {"field": "query", "document": document}},
-                        ]
-                    }
-                }
-            },
-        )
-
-    score = 0
-
-    for hit in matched_queries["hits"]["hits"]:
-        query_score = hit["_source"].get("score", 0)
-        score += query_score
-    return score
+    return _query_score(**_query_data(record, features))
@@ -5,7 +5,9 @@
 from celery import shared_task
 from flask import current_app
 from invenio_access.permissions import system_identity
+from invenio_cache import current_cache
 from invenio_communities.proxies import current_communities
+from invenio_db import db
 from invenio_db.uow import UnitOfWork
 from invenio_rdm_records.proxies import current_rdm_records_service as records_service
 from invenio_records_resources.services.uow import RecordCommitOp
@@ -19,11 +21,45 @@ from invenio_requests.proxies import (
     current_user_moderation_service as user_moderation_service,
 )
 from invenio_requests.records.api import Request
+from invenio_requests.records.models import RequestMetadata
 from invenio_requests.services.user_moderation.errors import OpenRequestAlreadyExists
-from invenio_search.engine import dsl
 from invenio_users_resources.proxies import current_users_service as users_service
 
 
+def _cache_user_moderation_request_id(user_id, request_id):
+    current_cache.set(
+        f"moderation:user_request:{user_id}",
+        str(request_id),
+        timeout=current_app.config["MODERATION_USER_REQUEST_CACHE_TIMEOUT"],
+    )
+
+
+def get_user_moderation_request_id(user_id):
+    """Return the ID of the moderation request of a user (open or closed), if any.
+
+    The request is looked up in the database by its type and topic (using the
+    ``ix_request_metadata_type_topic_user`` index), so that requests created
+    but not yet indexed are found too.
+    """
+    request_id = current_cache.get(f"moderation:user_request:{user_id}")
+    if request_id is not None:
+        return request_id
+
+    request_id = (
+        db.session.query(RequestMetadata.id)
+        .filter(
+            RequestMetadata.json["type"].as_string() == UserModerationRequest.type_id,
+            RequestMetadata.json[("topic", "user")].as_string() == str(user_id),
+        )
+        .order_by(RequestMetadata.created.desc())
+        .limit(1)
+        .scalar()
+    )
+    if request_id is not None:
+        _cache_user_moderation_request_id(user_id, request_id)
+        return str(request_id)
+
+
 @shared_task(ignore_result=True)
 def update_moderation_request(user_id, action_ctx):
     """Update a moderation request from an automated moderation action.
@@ -33,20 +69,10 @@ def update_moderation_request(user_id, action_ctx):
     exists for the user, a new one is created.
     """
     # Find the moderation request for the user (even if it's closed)
-    results = requests_service.search(
-        system_identity,
-        extra_filter=dsl.query.Bool(
-            "must",
-            # NOTE: We don't filter by is_open=True, since we also need closed requests
-            must=[
-                dsl.Q("term", **{"type": UserModerationRequest.type_id}),
-                dsl.Q("term", **{"topic.user": user_id}),
-            ],
-        ),
-    )
-    request_id = next(results.hits)["id"] if results.total > 0 else None
+    request_id = get_user_moderation_request_id(user_id)
 
     # NOTE: We only need the unit of work becase we might need to create a new request
+    created = False
     with UnitOfWork() as uow:
         # If no request exists, create a new one
         if request_id is None:
@@ -54,6 +80,7 @@ def update_moderation_request(user_id, action_ctx):
                 request_id = user_moderation_service.request_moderation(
                     system_identity, user_id=user_id, uow=uow
                 ).id
+                created = True
                 current_app.logger.debug(
                     "User moderation request created",
                     extra={"request_id": request_id, "user_id": user_id},
@@ -102,6 +129,9 @@ def update_moderation_request(user_id, action_ctx):
 
         uow.commit()
 
+    if created:
+        _cache_user_moderation_request_id(user_id, request_id)
+
 
 @shared_task(ignore_result=True)
 def run_moderation_handlers(user_id, record_id=None, community_id=None):
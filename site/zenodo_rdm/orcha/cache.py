@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Persistent cache of funding relevance LLM workflow results.
+
+Results are stored in the database by the hash of the workflow input (record
+title and description, and award description) and the hash of the rule given to
+the LLM, so that the same record and award pair is evaluated once for all
+checks and curation rules. Cache hits and misses are counted in the cache.
+"""
+
+import hashlib
+import json
+
+from flask import current_app
+from invenio_cache import current_cache
+from invenio_db import db
+
+from .models import FundingRelevanceResult
+
+HITS_CACHE_KEY = "orcha:funding_relevance:hits"
+MISSES_CACHE_KEY = "orcha:funding_relevance:misses"
+
+
+def _hash(value):
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def get_result_key(metadata, award_description, rule):
+    """Return the ``(input_hash, rule_hash)`` key of a workflow result."""
+    input_hash = _hash({**metadata, "award_description": award_description})
+    return input_hash, _hash(rule)
+
+
+def _incr(key):
+    try:
+        current_cache.inc(key)
+    except Exception:
+        # The counters are informative only
+        current_app.logger.warning("Failed to count funding relevance cache use")
+
+
+def get_result(key):
+    """Return the cached result of a workflow, or None."""
+    max_age = current_app.config["ZENODO_FUNDING_RELEVANCE_CACHE_TTL"]
+    result = FundingRelevanceResult.get(*key, max_age)
+    _incr(HITS_CACHE_KEY if result is not None else MISSES_CACHE_KEY)
+    return result
+
+
+def set_result(key, result):
+    """Store the result of a workflow, if it is final.
+
+    The result is stored in a savepoint, and committed by the caller.
+    """
+    # Timed out and failed workflows are run again
+    if result.get("match") is None:
+        return
+    with db.session.begin_nested():
+        FundingRelevanceResult.set(*key, result)
+
+
+def purge_expired():
+    """Delete the results older than the cache TTL, returning their number."""
+    max_age = current_app.config["ZENODO_FUNDING_RELEVANCE_CACHE_TTL"]
+    return FundingRelevanceResult.delete_expired(max_age)
+
+
+def get_stats():
+    """Return the hits, misses and hit rate of the cache."""
+    hits = int(current_cache.get(HITS_CACHE_KEY) or 0)
+    misses = int(current_cache.get(MISSES_CACHE_KEY) or 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else None,
+    }
@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2026 CERN
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Orcha models."""
+
+from datetime import datetime
+
+from invenio_db import db
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy_utils import Timestamp
+
+
+class FundingRelevanceResult(db.Model, Timestamp):
+    """Result of a funding relevance LLM workflow, by input and rule hash."""
+
+    __tablename__ = "orcha_funding_relevance_results"
+
+    input_hash = db.Column(db.String(64), primary_key=True)
+    rule_hash = db.Column(db.String(64), primary_key=True)
+    result = db.Column(db.JSON, nullable=False)
+
+    @classmethod
+    def get(cls, input_hash, rule_hash, max_age):
+        """Return the result of a workflow, unless older than ``max_age``."""
+        return (
+            cls.query.with_entities(cls.result)
+            .filter(
+                cls.input_hash == input_hash,
+                cls.rule_hash == rule_hash,
+                cls.updated >= datetime.utcnow() - max_age,
+            )
+            .scalar()
+        )
+
+    @classmethod
+    def set(cls, input_hash, rule_hash, result):
+        """Create or update the result of a workflow."""
+        statement = pg_insert(cls).values(
+            input_hash=input_hash, rule_hash=rule_hash, result=result
+        )
+        db.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[cls.input_hash, cls.rule_hash],
+                set_={
+                    "result": statement.excluded.result,
+                    "updated": datetime.utcnow(),
+                },
+            )
+        )
+
+    @classmethod
+    def delete_expired(cls, max_age):
+        """Delete the results older than ``max_age``, returning their number."""
+        return cls.query.filter(cls.updated < datetime.utcnow() - max_age).delete(
+            synchronize_session=False
+        )
@@ -5,6 +5,8 @@ import time
 
 from invenio_app_rdm.orcha.views import _orcha_client, _workflow_token
 
+from .cache import get_result, get_result_key, set_result
+
 FUNDING_CHECK_INSTRUCTIONS = """
     Given a record's title and description, and an EU grant's official description,
     determine whether the record is plausibly related to the grant.
@@ -17,8 +19,16 @@ FUNDING_CHECK_INSTRUCTIONS = """
     - message: a one-sentence explanation of your decision
 """
 
-def run_funding_relevance_workflow(metadata, award_description, rule=""):
-    """Run the funding relevance LLM workflow, returning the result dict or {} on timeout."""
+
+def get_funding_relevance_key(metadata, award_description, rule=""):
+    """Return the key of a funding relevance workflow result in the result cache."""
+    return get_result_key(
+        metadata, award_description, rule or FUNDING_CHECK_INSTRUCTIONS
+    )
+
+
+def trigger_funding_relevance_workflow(metadata, award_description, rule=""):
+    """Trigger the funding relevance LLM workflow, returning its ID."""
     client = _orcha_client()
     token = _workflow_token(client)
     response = client.trigger_workflow(
@@ -32,15 +42,56 @@ def run_funding_relevance_workflow(metadata, award_description, rule=""):
         },
         token=token,
     )
-    workflow_id = response["public_id"]
-    # poll for result using a scoped token
+    return response["public_id"]
+
+
+def get_funding_relevance_workflow_result(workflow_id, client=None):
+    """Return the result dict of a funding relevance workflow, or None if it is not done."""
+    client = client or _orcha_client()
+    # use a token scoped to the workflow
     workflow_token = _workflow_token(client, workflow_id)
-    # Poll until done
-    for _ in range(20):
-        time.sleep(3)
-        data = client.get_workflow(workflow_id, workflow_token)
-        if data["status"] in ("success", "error"):
-            result = data.get("result") or {}
-            result["workflow_id"] = workflow_id
-            return result
-    return {}
+    data = client.get_workflow(workflow_id, workflow_token)
+    if data["status"] in ("success", "error"):
+        result = data.get("result") or {}
+        result["workflow_id"] = workflow_id
+        return result
+    return None
+
+
+def wait_for_funding_relevance_workflows(workflow_ids, attempts=20, interval=3):
+    """Poll workflows together until done, returning their result dicts by ID.
+
+    Workflows not done after all attempts have an empty dict as result.
+    """
+    results = {workflow_id: {} for workflow_id in workflow_ids}
+    if not results:
+        return results
+
+    client = _orcha_client()
+    pending = set(workflow_ids)
+    for _ in range(attempts):
+        if not pending:
+            break
+        time.sleep(interval)
+        for workflow_id in list(pending):
+            result = get_funding_relevance_workflow_result(workflow_id, client)
+            if result is not None:
+                results[workflow_id] = result
+                pending.discard(workflow_id)
+    return results
+
+
+def run_funding_relevance_workflow(metadata, award_description, rule=""):
+    """Run the funding relevance LLM workflow, returning the result dict or {} on timeout.
+
+    The result of the same input and rule is reused from the result cache.
+    """
+    key = get_funding_relevance_key(metadata, award_description, rule)
+    result = get_result(key)
+    if result is not None:
+        return result
+
+    workflow_id = trigger_funding_relevance_workflow(metadata, award_description, rule)
+    result = wait_for_funding_relevance_workflows([workflow_id])[workflow_id]
+    set_result(key, result)
+    return result
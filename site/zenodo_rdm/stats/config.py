@@ -7,6 +7,9 @@ STATS_PIWIK_EXPORTER = {
     "url": "https://analytics.openaire.eu/piwik.php",
     "token_auth": "api-token",
     "chunk_size": 50,  # [max piwik payload size = 64k] / [max querystring size = 750]
+    "record_cache_timeout": 60 * 60 * 24,  # records are cached for a day
+    "workers": 4,  # number of concurrent requests
+    "window": 16,  # max number of chunks sent but not yet acknowledged
 }
 
 STATS_PIWIK_EXPORT_ENABLED = False
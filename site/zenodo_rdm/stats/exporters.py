@@ -3,19 +3,21 @@
 """ZenodoRDM stats exporters."""
 
 import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode, urlsplit, urlunsplit
 
 import requests
 from dateutil.parser import parse as dateutil_parse
 from flask import current_app, url_for
 from invenio_cache import current_cache
-from invenio_pidstore.errors import PIDDeletedError
 from invenio_search import current_search_client
 from invenio_search.utils import build_alias_name
 from opensearch_dsl import Search
 
 from zenodo_rdm.stats.errors import PiwikExportRequestError
-from zenodo_rdm.stats.utils import chunkify, fetch_record
+from zenodo_rdm.stats.utils import chunkify, fetch_records
 
 
 class PiwikExporter:
@@ -51,91 +53,148 @@ class PiwikExporter:
         token_auth = current_app.config["STATS_PIWIK_EXPORTER"].get("token_auth", None)
         chunk_size = current_app.config["STATS_PIWIK_EXPORTER"].get("chunk_size", 0)
 
-        for event_chunk in chunkify(events, chunk_size):
-            query_strings = []
-            for event in event_chunk:
-                if "recid" not in event:
-                    continue
-                try:
-                    query_string = self._build_query_string(event)
-                    query_strings.append(query_string)
-                except PIDDeletedError:
-                    pass
-
-            # Check and bail if the bookmark has progressed, e.g. from another
-            # duplicate task or manual run of the exporter.
-            bookmark = current_cache.get("piwik_export:bookmark")
-            if event_chunk[-1].timestamp < bookmark:
-                return
+        start = time.perf_counter()
+        self.exported = 0
+        try:
+            self._export(events, url, token_auth, chunk_size, update_bookmark)
+        finally:
+            duration = time.perf_counter() - start
+            rate = self.exported / duration if duration else 0
+            current_app.logger.info(
+                f"Exported {self.exported:_} events in {duration:.1f}s "
+                f"({rate:.1f} events/sec)"
+            )
 
-            payload = {"requests": query_strings, "token_auth": token_auth}
-            res = requests.post(url, json=payload, timeout=60)
-
-            # Failure: not 200 or not "success"
-            content = res.json() if res.ok else None
-            if res.status_code == 200 and content.get("status") == "success":
-                if content.get("invalid") != 0:
-                    msg = "Invalid events in Piwik export request."
-                    info = {
-                        "begin_event_timestamp": event_chunk[0].timestamp,
-                        "end_event_timestamp": event_chunk[-1].timestamp,
-                        "invalid_events": content.get("invalid"),
-                    }
-                    current_app.logger.warning(msg, extra=info)
-                elif update_bookmark is True:
-                    current_cache.set(
-                        "piwik_export:bookmark", event_chunk[-1].timestamp, timeout=-1
-                    )
-            else:
+    def _export(self, events, url, token_auth, chunk_size, update_bookmark):
+        """Send the events to Piwik in chunks.
+
+        Chunks are built while previous ones are being sent by a pool of
+        workers, with at most ``window`` chunks in flight. Responses are
+        handled in the order of the chunks, so that the bookmark only advances
+        past chunks that were all acknowledged.
+        """
+        workers = current_app.config["STATS_PIWIK_EXPORTER"].get("workers", 1)
+        window = current_app.config["STATS_PIWIK_EXPORTER"].get("window", workers)
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        in_flight = deque()
+        try:
+            for event_chunk in chunkify(events, chunk_size):
+                query_strings = self._build_query_strings(event_chunk)
+
+                # Check and bail if the bookmark has progressed, e.g. from another
+                # duplicate task or manual run of the exporter.
+                bookmark = current_cache.get("piwik_export:bookmark")
+                if event_chunk[-1].timestamp < bookmark:
+                    return
+
+                payload = {"requests": query_strings, "token_auth": token_auth}
+                future = executor.submit(session.post, url, json=payload, timeout=60)
+                in_flight.append((event_chunk, future))
+                if len(in_flight) >= window:
+                    self._acknowledge(*in_flight.popleft(), update_bookmark)
+
+            while in_flight:
+                self._acknowledge(*in_flight.popleft(), update_bookmark)
+        finally:
+            # Chunks after a failed (or skipped) one are not acknowledged, and
+            # will be sent again by the next run.
+            executor.shutdown(cancel_futures=True)
+            session.close()
+
+    def _acknowledge(self, event_chunk, future, update_bookmark):
+        """Handle the Piwik response for a chunk of events."""
+        res = future.result()
+
+        # Failure: not 200 or not "success"
+        content = res.json() if res.ok else None
+        if res.status_code == 200 and content.get("status") == "success":
+            if content.get("invalid") != 0:
                 msg = "Invalid events in Piwik export request."
                 info = {
                     "begin_event_timestamp": event_chunk[0].timestamp,
                     "end_event_timestamp": event_chunk[-1].timestamp,
+                    "invalid_events": content.get("invalid"),
                 }
-                raise PiwikExportRequestError(msg, export_info=info)
-
-    def _build_query_string(self, event):
+                current_app.logger.warning(msg, extra=info)
+            elif update_bookmark is True:
+                current_cache.set(
+                    "piwik_export:bookmark", event_chunk[-1].timestamp, timeout=-1
+                )
+        else:
+            msg = "Invalid events in Piwik export request."
+            info = {
+                "begin_event_timestamp": event_chunk[0].timestamp,
+                "end_event_timestamp": event_chunk[-1].timestamp,
+            }
+            raise PiwikExportRequestError(msg, export_info=info)
+
+        self.exported += len(event_chunk)
+
+    def _build_query_strings(self, event_chunk):
+        """Build the query strings of a chunk of events.
+
+        The records of the whole chunk are fetched at once, and events of
+        deleted records are skipped.
+        """
+        events = [event for event in event_chunk if "recid" in event]
+        records = fetch_records(
+            [event.recid for event in events],
+            timeout=current_app.config["STATS_PIWIK_EXPORTER"].get(
+                "record_cache_timeout", None
+            ),
+        )
         siteurl = current_app.config["SITE_UI_URL"]
         with current_app.test_request_context(base_url=siteurl):
-            id_site = current_app.config["STATS_PIWIK_EXPORTER"].get("id_site", None)
-            url = url_for(
-                "invenio_app_rdm_records.record_detail",
+            return [
+                self._build_query_string(event, records[event.recid])
+                for event in events
+                if records[event.recid]
+            ]
+
+    def _build_query_string(self, event, record):
+        id_site = current_app.config["STATS_PIWIK_EXPORTER"].get("id_site", None)
+        url = url_for(
+            "invenio_app_rdm_records.record_detail",
+            pid_value=event.recid,
+            scheme="https",
+            _external=True,
+        )
+        visitor_id = event.visitor_id[0:16]
+        oai, action_name = record["oai_id"], record["title"]
+        cvar = json.dumps({"1": ["oaipmhID", oai]})
+        urlref = None
+        if event.referrer:
+            try:
+                scheme, netloc, path, _, _ = urlsplit(event.referrer)
+                urlref = urlunsplit((scheme, netloc, path, None, None))
+            except Exception:
+                pass
+
+        params = dict(
+            idsite=id_site,
+            rec=1,
+            url=url,
+            _id=visitor_id,
+            cid=visitor_id,
+            cvar=cvar,
+            cdt=event.timestamp,
+            urlref=urlref,
+            action_name=action_name,
+        )
+
+        if event.to_dict().get("country"):
+            params["country"] = event.country.lower()
+        if event.to_dict().get("file_key"):
+            params["url"] = url_for(
+                "invenio_app_rdm_records.record_file_download",
                 pid_value=event.recid,
-                scheme="https",
-                _external=True,
+                filename=event.file_key,
             )
-            visitor_id = event.visitor_id[0:16]
-            record = fetch_record(event.recid)
-            oai, action_name = record["oai_id"], record["title"]
-            cvar = json.dumps({"1": ["oaipmhID", oai]})
-            urlref = None
-            if event.referrer:
-                try:
-                    scheme, netloc, path, _, _ = urlsplit(event.referrer)
-                    urlref = urlunsplit((scheme, netloc, path, None, None))
-                except Exception:
-                    pass
-
-            params = dict(
-                idsite=id_site,
-                rec=1,
-                url=url,
-                _id=visitor_id,
-                cid=visitor_id,
-                cvar=cvar,
-                cdt=event.timestamp,
-                urlref=urlref,
-                action_name=action_name,
-            )
-
-            if event.to_dict().get("country"):
-                params["country"] = event.country.lower()
-            if event.to_dict().get("file_key"):
-                params["url"] = url_for(
-                    "invenio_app_rdm_records.record_file_download",
-                    pid_value=event.recid,
-                    filename=event.file_key,
-                )
-                params["download"] = params["url"]
+            params["download"] = params["url"]
 
-            return "?{}".format(urlencode(params, "utf-8"))
+        return "?{}".format(urlencode(params, "utf-8"))
@@ -5,6 +5,10 @@
 import itertools
 from functools import lru_cache
 
+from invenio_cache import current_cache
+from invenio_db import db
+from invenio_pidstore.errors import PIDDeletedError
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 from invenio_rdm_records.proxies import current_rdm_records_service
 
 
@@ -18,11 +22,66 @@ def chunkify(iterable, n):
         yield chunk
 
 
+def _record_info(record):
+    return {
+        "oai_id": record.get("oai", {}).get("identifier"),
+        "title": record.get("metadata", {}).get("title")[:150],  # max 150 characters
+    }
+
+
 @lru_cache(maxsize=1024)
 def fetch_record(recid):
     """Cached record fetch."""
     record = current_rdm_records_service.record_cls.pid.resolve(recid)
-    return {
-        "oai_id": record.get("oai", {}).get("identifier"),
-        "title": record.get("metadata", {}).get("title")[:150],  # max 150 characters
+    return _record_info(record)
+
+
+def fetch_records(recids, timeout=None):
+    """Fetch many records at once, through a cache shared between workers.
+
+    Returns the records by recid, where deleted records are empty. Records that
+    are not in the cache are resolved with a single query, and only the ones it
+    cannot resolve (e.g. redirected PIDs) are resolved one by one.
+    """
+    keys = {recid: f"piwik_export:record:{recid}" for recid in set(recids)}
+    cached = current_cache.get_many(*keys.values())
+    records = {
+        recid: record for recid, record in zip(keys, cached) if record is not None
     }
+
+    missing = [recid for recid in keys if recid not in records]
+    if not missing:
+        return records
+
+    model_cls = current_rdm_records_service.record_cls.model_cls
+    rows = (
+        db.session.query(
+            PersistentIdentifier.pid_value,
+            PersistentIdentifier.status,
+            model_cls.json,
+        )
+        .join(model_cls, model_cls.id == PersistentIdentifier.object_uuid)
+        .filter(
+            PersistentIdentifier.pid_type == "recid",
+            PersistentIdentifier.pid_value.in_(missing),
+        )
+    )
+    resolved = {}
+    for recid, status, data in rows:
+        if status == PIDStatus.DELETED:
+            resolved[recid] = {}
+        elif status == PIDStatus.REGISTERED and data:
+            resolved[recid] = _record_info(data)
+
+    for recid in missing:
+        if recid not in resolved:
+            try:
+                resolved[recid] = fetch_record(recid)
+            except PIDDeletedError:
+                resolved[recid] = {}
+
+    current_cache.set_many(
+        {keys[recid]: record for recid, record in resolved.items()},
+        timeout=timeout,
+    )
+    return {**records, **resolved}